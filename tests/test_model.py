@@ -1,14 +1,17 @@
+import io
 import json
 import pytest
 from decimal import Decimal
 from yangson import DataModel
 from yangson.exceptions import (
     InvalidFeatureExpression, UnknownPrefix, NonexistentInstance,
-    NonexistentSchemaNode, RawTypeError, SchemaError,
-    XPathTypeError, InvalidXPath, NotSupported)
-from yangson.instvalue import ArrayValue
-from yangson.schemadata import SchemaContext, FeatureExprParser
-from yangson.enumerations import ContentType
+    NonexistentSchemaNode, RawMemberError, RawTypeError, SchemaError,
+    SemanticError, UnexpectedInput, XPathTypeError, InvalidArgument,
+    InvalidXPath, NotSupported)
+from yangson.instvalue import ArrayValue, ObjectValue
+from yangson.parser import JSONStreamParser
+from yangson.schemadata import SchemaContext, SchemaData, FeatureExprParser
+from yangson.enumerations import ContentType, TimestampMode, ValidationScope
 from yangson.xpathparser import XPathParser
 
 tree = """+--rw (test:choiA)?
@@ -84,6 +87,13 @@ def data_model():
                                ["yang-modules/test", "yang-modules/ietf"])
 
 
+@pytest.fixture
+def cons_model():
+    return DataModel.from_file(
+        "yang-modules/test_constraints/yang-library.json",
+        ["yang-modules/test_constraints"])
+
+
 @pytest.fixture
 def instance(data_model):
     data = """
@@ -149,6 +159,44 @@ def test_schema_data(data_model):
     assert not data_model.schema_data.is_derived_from(
         ("CC-BY-SA", "testb"), ("derivatives", "test"))
     assert data_model.schema_data.is_derived_from(("CC-BY-SA", "testb"), ("all-uses", "test"))
+    dm2 = DataModel.from_file("yang-modules/test/yang-library.json",
+                              ["yang-modules/test", "yang-modules/ietf"])
+    assert (dm2.schema_data.modules[tid].statement is
+            data_model.schema_data.modules[tid].statement)
+    csize = SchemaData.module_cache_size
+    SchemaData.module_cache_size = 1
+    SchemaData._module_cache.clear()
+    try:
+        dm3, dm4 = [
+            DataModel.from_file("yang-modules/test/yang-library.json",
+                                ["yang-modules/test", "yang-modules/ietf"])
+            for i in range(2)]
+    finally:
+        SchemaData.module_cache_size = csize
+    for mid, mdata in dm4.schema_data.modules.items():
+        assert mdata.statement is dm3.schema_data.modules[mid].statement
+
+
+def test_cache(data_model, tmpdir):
+    cache = str(tmpdir.join("dm.cache"))
+    modpath = [str(tmpdir), "yang-modules/ietf"]
+    for m in ("test", "testb", "subtest", "defs"):
+        fn = m + "@2016-04-26.yang"
+        with open("yang-modules/test/" + fn) as infile:
+            tmpdir.join(fn).write(infile.read())
+    with open("yang-modules/test/yang-library.json") as infile:
+        yltxt = infile.read()
+    dm1 = DataModel.from_cache(cache, yltxt, modpath)
+    assert tmpdir.join("dm.cache").check()
+    assert tmpdir.listdir(fil="*.tmp") == []
+    dm2 = DataModel.from_cache(cache, yltxt, modpath)
+    assert dm2.module_set_id() == data_model.module_set_id()
+    assert dm2.ascii_tree() == dm1.ascii_tree()
+    assert dm2.get_data_node("/test:contA/listA").keys == [("leafE", "test"), ("leafF", "test")]
+    tmpdir.join("testb@2016-04-26.yang").write("// changed\n", mode="a")
+    dm3 = DataModel.from_cache(cache, yltxt, modpath)
+    assert dm3.schema is not dm2.schema
+    assert dm3.ascii_tree() == dm1.ascii_tree()
 
 
 def test_schema(data_model):
@@ -199,6 +247,58 @@ def test_schema(data_model):
     assert data_model.get_data_node("/testb:noA/leafO") is None
 
 
+def test_xpath_binding(data_model, instance):
+    assert data_model.unresolved_steps == []
+    ca = data_model.get_data_node("/test:contA")
+    la = ca.get_child("leafA")
+    rel = ca.must[0].expression.primary.expr
+    assert rel.left._bindings[ca] == (("leafA", "test"), la, "leafA")
+    ce = data_model.get_data_node("/test:contA/listA/contD/contE")
+    lp = ce.get_child("leafP")
+    assert ce in lp.when.left.right._bindings
+    conta = instance["test:contA"]
+    assert ca.must[0].expression.evaluate(conta) is True
+    lb = rel.right.evaluate(conta)
+    assert len(lb) == 1 and lb[0].value == 9
+    assert lb[0].schema_node is ca.get_child("leafB")
+
+
+def test_constraint_dependencies(data_model):
+    assert data_model.constraint_dependencies("/test:contA") == {
+        "must": [["/test:contA/leafA", "/test:contA/leafB"]]}
+    assert data_model.constraint_dependencies(
+        "/test:contA/listA/contD/contE/leafP") == {"when": [
+            "/test:contA/listA/contD/contE",
+            "/test:contA/listA/contD/contE/leafU"]}
+    assert data_model.constraint_dependencies(
+        "/test:contA/testb:leafR")["path"] == [
+            "/test:contA", "/test:contA/listA", "/test:contA/listA/leafE"]
+    assert data_model.constraint_dependencies("/test:contT") == {}
+    assert data_model.constraint_dependencies("/test:contA/leafZ") is None
+
+
+def test_wildcard_steps(cons_model):
+    assert cons_model.unresolved_steps == []
+    assert cons_model.constraint_dependencies("/cons:contA") == {
+        "must": [["/cons:contA/leafA", "/cons:contA/leafB",
+                  "/cons:contA/leafC"]]}
+    assert cons_model.constraint_dependencies("/cons:contA/leafB") == {
+        "when": ["/cons:contA", "/cons:contA/leafA", "/cons:contA/leafB",
+                 "/cons:contA/leafC"]}
+    assert cons_model.constraint_dependencies("/cons:contA/leafC") == {
+        "must": [["/cons:contA/leafC"], ["/cons:contA/leafC"],
+                 ["/cons:contA/leafC"]]}
+    inst = cons_model.from_raw({"cons:contA": {"leafA": 1, "leafB": 2}})
+    inst.validate()
+
+
+def test_must_errors(cons_model):
+    inst = cons_model.from_raw({"cons:contA": {"leafC": 7}})
+    errs = inst.validation_errors()
+    assert [(e.path, e.tag) for e in errs] == [
+        ("/cons:contA/leafC", "too-small"), ("/cons:contA/leafC", "too-large")]
+    assert len(inst.validation_errors(max_errors=1)) == 1
+
 def test_tree(data_model):
     assert data_model.ascii_tree() == tree
 
@@ -335,7 +435,10 @@ def test_xpath(data_model, instance):
     def xptest(expr, res=True, node=instance, module="test"):
         mid = data_model.schema_data.last_revision(module)
         xpp = XPathParser(expr, SchemaContext(data_model.schema_data, module, mid))
-        assert xpp.parse().evaluate(node) == res
+        ex = xpp.parse()
+        assert ex.evaluate(node) == res
+        ex.compile()
+        assert ex.evaluate(node) == res
     conta = instance["test:contA"]
     lr = conta["testb:leafR"]
     with pytest.raises(InvalidXPath):
@@ -447,6 +550,9 @@ def test_xpath(data_model, instance):
     xptest("re-match('aaax', 'a*')", False)
     xptest("re-match('a\nb', '.*')", False)
     xptest("re-match('a\nb', '[a-z\n]*')")
+    xptest("re-match('abc', concat('a', '.*'))")
+    with pytest.raises(InvalidArgument):
+        xptest("re-match('abc', '[a')")
     xptest("deref(.)/../t:leafF", True, lr, "testb")
     xptest("deref(../leafS)", 10, lr, "testb")
     xptest("count(deref(../leafS) | ../leafN)", 2, lr, "testb")
@@ -463,6 +569,14 @@ def test_xpath(data_model, instance):
     xptest("string(enum-value(.))", "NaN", lr, "testb")
     xptest("bit-is-set(//bits, 'dos') and bit-is-set(//bits, 'cuatro')")
     xptest("not(bit-is-set(foo, bar))")
+    xptest("leafA > leafB or count(//*) = 0", node=conta)
+    xptest("leafA < leafB and count(//*) > 0", False, conta)
+    xptest("true() or sum(42) > 0")
+    xptest("false() and sum(42) > 0", False)
+    with pytest.raises(XPathTypeError):
+        xptest("false() or sum(42) > 0")
+    with pytest.raises(XPathTypeError):
+        xptest("true() and sum(42) > 0")
     xptest("bit-is-set(., 'dos')", False, conta)
 
 
@@ -494,6 +608,18 @@ def test_edits(data_model, instance):
         {"leafE": "B00F", "leafF": False}, raw=True).top()
     assert instance.peek(laii)[1]["leafE"] == "ABBA"
     assert inst1.peek(laii)[1]["leafE"] == "B00F"
+    assert la[1].up().value is la.value
+    assert la[0].next().value is la.value[1]
+    mod1 = la[1].update({"leafE": "B00F", "leafF": False}, raw=True)
+    assert mod1.previous().next().value["leafE"] == "B00F"
+    modla = la[0].insert_after(
+        {"leafE": "ABCD", "leafF": True}, raw=True).up()
+    assert [e["leafE"] for e in modla.value] == ["C0FFEE", "ABCD", "ABBA"]
+    assert la.look_up(leafE="ABBA", leafF=False).index == 1
+    mod2 = la[1].update({"leafE": "ABBA", "leafF": True}, raw=True).up()
+    assert mod2.look_up(leafE="ABBA", leafF=True).index == 1
+    with pytest.raises(NonexistentInstance):
+        mod2.look_up(leafE="ABBA", leafF=False)
     modla = la.delete_item(1)
     assert len(modla.value) == 1
     llb1 = instance["test:llistB"][1]
@@ -503,8 +629,180 @@ def test_edits(data_model, instance):
         llb1.update("2001::2::1", raw=True)
 
 
+def test_structured_values():
+    obj = ObjectValue({"x": 1})
+    hash(obj)
+    obj.update(x=2)
+    assert obj == ObjectValue({"x": 2})
+    obj.setdefault("y", 3)
+    assert obj == ObjectValue({"x": 2, "y": 3})
+    obj.pop("x")
+    assert obj == ObjectValue({"y": 3})
+    ary = ArrayValue([1, 2])
+    hash(ary)
+    ary.append(3)
+    assert ary == ArrayValue([1, 2, 3])
+    ary.sort(reverse=True)
+    assert ary == ArrayValue([3, 2, 1])
+    ary.remove(2)
+    assert ary == ArrayValue([3, 1])
+
+
+def test_array_key_index():
+    ary = ArrayValue([ObjectValue({"k": 1}), ObjectValue({"k": 2})])
+    assert ary.key_lookup(("k",), (2,)) == 1
+    ary.insert(0, ObjectValue({"k": 0}))
+    assert ary.key_lookup(("k",), (2,)) == 2
+    ary.append(ObjectValue({"k": 3}))
+    assert ary.key_lookup(("k",), (3,)) == 3
+    ary += [ObjectValue({"k": 4})]
+    assert ary.key_lookup(("k",), (4,)) == 4
+    ary.reverse()
+    assert ary.key_lookup(("k",), (4,)) == 0
+    ary.pop(0)
+    assert ary.key_lookup(("k",), (4,)) is None
+    ary.clear()
+    assert ary.key_lookup(("k",), (0,)) is None
+
+def test_raw_errors(data_model):
+    inst = data_model.from_raw({"test:contA": {"test:leafB": 9}})
+    assert inst.value["test:contA"]["leafB"] == 9
+    with pytest.raises(RawTypeError) as e:
+        data_model.from_raw({"test:contA": {"leafB": "nine"}})
+    assert e.value.path == "/test:contA/leafB"
+    with pytest.raises(RawMemberError) as e:
+        data_model.from_raw({"test:contA": {"listA": [
+            {"leafE": "C0FFEE", "leafF": True}, {"leafZ": 0}]}})
+    assert e.value.path == "/test:contA/listA/2/leafZ"
+
+
+def test_json_stream(data_model):
+    raw = {"test:llistB": ["::1", "127.0.0.1"], "test:leafX": 53531,
+           "test:contA": {
+               "leafB": 9,
+               "listA": [{"leafE": "C0FFEE", "leafF": True,
+                          "contD": {"contE": {"leafJ": [None]}}},
+                         {"leafE": "ABBA", "leafW": 9, "leafF": False}],
+               "anydA": {"foo:bar": [1, 2.5, "\u00e9\\"]}},
+           "test:contT": {"decimal64": 4.5}}
+    text = json.dumps(raw, indent=2)
+    assert JSONStreamParser(io.StringIO(text), 3).value() == raw
+    inst = data_model.from_json_stream(io.StringIO(text))
+    assert inst.value == data_model.from_raw(raw).value
+    with pytest.raises(RawMemberError) as e:
+        data_model.from_json_stream(io.StringIO(
+            '{"test:contA": {"leafB": 9, "leafZ": [1, 2, 3]}}'))
+    assert e.value.path == "/test:contA/leafZ"
+    with pytest.raises(UnexpectedInput):
+        data_model.from_json_stream(io.StringIO('{"test:leafX": 53531} 0'))
+
+
+def test_json_output(data_model, instance):
+    text = "".join(instance.iter_json_chunks())
+    assert data_model.from_raw(json.loads(text)).value == instance.value
+    la = instance["test:contA"]["listA"]
+    for node in (la, la[0], instance["test:contT"]):
+        out = io.StringIO()
+        node.write_json(out, 2)
+        assert out.getvalue() == json.dumps(node.raw_value(), indent=2)
+
+
+def test_interned_names(data_model, instance):
+    conta = instance["test:contA"]
+    sn = data_model.get_data_node("/test:contA/leafB")
+    assert [k for k in conta.value if k is sn.iname()] == ["leafB"]
+    lb = conta.put_member("".join(["leaf", "B"]), 10)
+    assert lb.name is sn.iname()
+    assert lb.qual_name is sn.qual_name == ("leafB", "test")
+    mem = instance.put_member("testb:leafQ", "ABBA")
+    assert mem.qual_name == ("leafQ", "testb")
+
+
+def test_timestamp_mode(data_model):
+    DataModel.set_timestamp_mode(TimestampMode.revision)
+    try:
+        inst = data_model.from_raw({"test:contA": {"leafB": 9}})
+        conta = inst["test:contA"]
+        ts = conta.timestamp
+        assert isinstance(ts, int)
+        inst2 = conta.put_member("leafB", 10).top()
+        assert inst2["test:contA"].timestamp > ts
+    finally:
+        DataModel.set_timestamp_mode(TimestampMode.datetime)
+
+
 def test_validation(instance):
     assert instance.validate(ctype=ContentType.all) is None
     inst2 = instance.put_member("testb:leafQ", "ABBA").top()
     with pytest.raises(SchemaError):
         inst2.validate(ctype=ContentType.all)
+    conta = instance["test:contA"]
+    lr = conta["testb:leafR"]
+    assert lr.schema_node.type._anchor is not None
+    inst3 = lr.update("DEAD", raw=True).top()
+    with pytest.raises(SemanticError):
+        inst3.validate(ctype=ContentType.all)
+    inst4 = conta["listA"][1]["leafW"].update(8, raw=True).top()
+    with pytest.raises(SemanticError):
+        inst4.validate(ctype=ContentType.all)
+
+
+def test_incremental_validation(instance):
+    ctype = ContentType.all
+    instance.validate(ctype=ctype)
+    conta = instance["test:contA"]
+    inst2 = conta["testb:leafN"].update("hello").top()
+    assert inst2.validate(ctype=ctype, previous=instance) is None
+    inst3 = conta["leafB"].update(10, raw=True).top()
+    with pytest.raises(SemanticError):
+        inst3.validate(ctype=ctype, previous=instance)
+    inst4 = conta["listA"][0]["contD"]["contE"]["leafP"].update(
+        300, raw=True).top()
+    with pytest.raises(SchemaError):
+        inst4.validate(ctype=ctype, previous=instance)
+
+
+def test_parallel_validation(instance):
+    ctype = ContentType.all
+    assert instance.validate(ctype=ctype, workers=2) is None
+    inst2 = instance["test:contA"]["leafB"].update(10, raw=True).top()
+    with pytest.raises(SemanticError) as seq:
+        inst2.validate(ctype=ctype)
+    with pytest.raises(SemanticError) as par:
+        inst2.validate(ctype=ctype, workers=3)
+    assert str(par.value) == str(seq.value)
+    inst3 = inst2.put_member("testb:leafQ", "ABBA").top()
+    with pytest.raises(SchemaError):
+        inst3.validate(ctype=ctype, workers=2)
+    seqerrs = [str(e) for e in inst3.validation_errors(ctype=ctype)]
+    assert len(seqerrs) == 3
+    for w in (2, 3):
+        parerrs = inst3.validation_errors(ctype=ctype, workers=w)
+        assert [str(e) for e in parerrs] == seqerrs
+    parerrs = inst3.validation_errors(ctype=ctype, max_errors=2, workers=2)
+    assert [str(e) for e in parerrs] == seqerrs[:2]
+
+
+def test_validation_errors(instance):
+    ctype = ContentType.all
+    assert instance.validation_errors(ctype=ctype) == []
+    inst2 = instance["test:contA"]["leafB"].update(10, raw=True).top()
+    inst3 = inst2.put_member("testb:leafQ", "ABBA").top()
+    errs = inst3.validation_errors(ctype=ctype)
+    assert [(e.path, e.tag, e.error_tag) for e in errs] == [
+        ("/", "member-not-allowed", "unknown-element"),
+        ("/test:contA/listA/1/leafW", "instance-required", "data-missing"),
+        ("/testb:leafQ", "invalid-type", "invalid-value")]
+    assert isinstance(errs[1], SemanticError)
+    with pytest.raises(SchemaError) as seq:
+        inst3.validate(ctype=ctype)
+    first = inst3.validation_errors(ctype=ctype, max_errors=1)
+    assert len(first) == 1 and str(first[0]) == str(seq.value)
+    cval = instance["test:contA"].value
+    inst4 = instance["test:contA"].update(
+        ObjectValue(dict(cval, bogus=1))).top()
+    with pytest.raises(NonexistentSchemaNode):
+        inst4.validate(ValidationScope.semantics, ctype)
+    errs = inst4.validation_errors(ValidationScope.semantics, ctype)
+    assert [(e.path, e.tag, e.message) for e in errs] == [
+        ("/test:contA", "member-not-allowed", "bogus")]
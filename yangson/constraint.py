@@ -23,15 +23,23 @@ This module implements the following classes:
 * Intervals: Class representing a sequence of numeric intervals.
 * Pattern: Class representing regular expression pattern.
 * Must: Class representing the constraint specified by a "must" statement.
+
+and the following function:
+
+* compile_pattern: Translate and compile an XML Schema regular expression.
 """
 
 import decimal
 import re
-from typing import Callable, List, Optional, Union
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, List, Optional, Union
+from typing import Pattern as RegexPattern
 from pyxb.utils.xmlre import RegularExpressionError, XMLToPython
 
 from .exceptions import InvalidArgument
-from .xpathast import Expr
+
+if TYPE_CHECKING:
+    from .xpathast import Expr    # NOQA
 
 # Type aliases
 Number = Union[int, decimal.Decimal]
@@ -41,6 +49,36 @@ Interval = List[Number]
 """Numeric interval consisting either of one number or a pair of bounds."""
 
 
+@lru_cache(maxsize=256)
+def compile_pattern(pattern: str) -> RegexPattern:
+    """Translate and compile an XML Schema regular expression.
+
+    Compiled patterns are kept in a bounded LRU cache, so that each
+    pattern is translated to the Python syntax only once.
+
+    Args:
+        pattern: Regular expression in the XML Schema syntax.
+
+    Returns:
+        Compiled Python regular expression.
+
+    Raises:
+        InvalidArgument: If `pattern` is not a valid regular expression.
+    """
+    try:
+        return re.compile(XMLToPython(pattern))
+    except (RegularExpressionError, re.error):
+        raise InvalidArgument(pattern) from None
+
+
+def _parse_int(x: str) -> Optional[int]:
+    """Default parser of interval bounds."""
+    try:
+        return int(x)
+    except ValueError:
+        return None
+
+
 class Constraint:
     """Abstract class representing annotated YANG constraints."""
 
@@ -57,14 +95,9 @@ class Intervals(Constraint):
                  parser: Callable[[str], Optional[Number]] = None,
                  error_tag: str = None, error_message: str = None):
         """Initialize the class instance."""
-        def _pint(x):                     # default parser
-            try:
-                return int(x)
-            except ValueError:
-                return None
         super().__init__(error_tag, error_message)
         self.intervals = intervals
-        self.parser = parser if parser else _pint
+        self.parser = parser if parser else _parse_int
 
     def __contains__(self, value: Number):
         """Return ``True`` if the receiver contains the value."""
@@ -138,16 +171,13 @@ class Pattern(Constraint):
                          "pattern '{}'".format(pattern))
         self.pattern = pattern
         self.invert_match = invert_match
-        try:
-            self.regex = re.compile(XMLToPython(pattern))
-        except RegularExpressionError:
-            raise InvalidArgument(pattern) from None
+        self.regex = compile_pattern(pattern)
 
 
 class Must(Constraint):
     """Class representing the constraint specified by a "must" statement."""
 
-    def __init__(self, expression: Expr, error_tag: str = None,
+    def __init__(self, expression: "Expr", error_tag: str = None,
                  error_message: str = None):
         """Initialize the class instance."""
         super().__init__(
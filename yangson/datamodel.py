@@ -24,11 +24,16 @@ This module implements the following class:
 
 import hashlib
 import json
-from typing import List, Optional
-from .enumerations import ContentType
-from .exceptions import BadYangLibraryData
+import os
+import pickle
+import threading
+from typing import Any, Dict, FrozenSet, List, Optional, TextIO
+from .enumerations import ContentType, TimestampMode
+from .exceptions import BadYangLibraryData, ModuleNotFound, UnexpectedInput
 from .instance import (InstanceRoute, InstanceIdParser, ResourceIdParser,
                        RootNode)
+from .instvalue import set_timestamp_mode
+from .parser import JSONStreamParser
 from .schemadata import SchemaData, SchemaContext
 from .schemanode import DataNode, SchemaTreeNode, RawObject, SchemaNode
 from .typealiases import DataPath, SchemaPath
@@ -37,6 +42,9 @@ from .typealiases import DataPath, SchemaPath
 class DataModel:
     """Basic user-level entry point to Yangson library."""
 
+    cache_format = 8
+    """Version of the format of data model cache files."""
+
     @classmethod
     def from_file(cls, name: str, mod_path: List[str] = ["."],
                   description: str = None) -> "DataModel":
@@ -57,6 +65,57 @@ class DataModel:
             yltxt = infile.read()
         return cls(yltxt, mod_path, description)
 
+    @classmethod
+    def from_cache(cls, cache: str, yltxt: str, mod_path: List[str] = ["."],
+                   description: str = None) -> "DataModel":
+        """Initialize the data model from a cache file, if it is up to date.
+
+        If the cache file doesn't exist or doesn't correspond to YANG
+        library data and current contents of module files, the data
+        model is built from YANG modules and the cache file rewritten.
+
+        Args:
+            cache: Name of the cache file.
+            yltxt: JSON text with YANG library data.
+            mod_path: List of directories where to look for YANG modules.
+            description: Optional description of the data model.
+
+        Returns:
+            The data model instance.
+
+        Raises:
+            The same exceptions as the class constructor above.
+        """
+        key = cls._cache_key(yltxt, mod_path)
+        if key is not None:
+            try:
+                with open(cache, "rb") as infile:
+                    if pickle.load(infile) == key:
+                        res = pickle.load(infile)
+                        res._set_description(description)
+                        return res
+            except (OSError, EOFError, AttributeError, ImportError,
+                    pickle.UnpicklingError):
+                pass
+        res = cls(yltxt, mod_path, description)
+        try:
+            res.save_cache(cache)
+        except OSError:                        # cache is just an optimization
+            pass
+        return res
+
+    @staticmethod
+    def set_timestamp_mode(mode: TimestampMode) -> None:
+        """Select the kind of timestamps of instance values.
+
+        The mode is common to all data models in the process, and
+        should be selected before any instance data are created.
+
+        Args:
+            mode: Timestamp mode.
+        """
+        set_timestamp_mode(mode)
+
     def __init__(self, yltxt: str, mod_path: List[str] = ["."],
                  description: str = None):
         """Initialize the class instance.
@@ -83,10 +142,30 @@ class DataModel:
             raise BadYangLibraryData(str(e)) from None
         self.schema_data = SchemaData(self.yang_library, mod_path)
         self._build_schema()
-        self.schema.description = description if description else (
-            "Data model ID: " +
-            self.yang_library["ietf-yang-library:modules-state"]
-            ["module-set-id"])
+        self._set_description(description)
+
+    def save_cache(self, cache: str) -> None:
+        """Save the compiled data model to a cache file.
+
+        The data model is first written to a temporary file in the same
+        directory that then replaces the cache file, so that concurrent
+        readers never see an incomplete cache.
+
+        Args:
+            cache: Name of the cache file.
+        """
+        key = self._cache_key(json.dumps(self.yang_library),
+                              self.schema_data.module_search_path)
+        tmp = "{}.{}.{}.tmp".format(cache, os.getpid(), threading.get_ident())
+        try:
+            with open(tmp, "wb") as outfile:
+                pickle.dump(key, outfile, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(self, outfile, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cache)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
 
     def module_set_id(self) -> str:
         """Compute unique id of YANG modules comprising the data model.
@@ -109,6 +188,31 @@ class DataModel:
         cooked = self.schema.from_raw(robj)
         return RootNode(cooked, self.schema, cooked.timestamp)
 
+    def from_json_stream(self, fp: TextIO) -> RootNode:
+        """Create an instance node from a file with JSON text.
+
+        The JSON text is transformed to the cooked form while it is
+        being parsed, without building a raw data tree.
+
+        Args:
+            fp: Text file containing JSON-encoded instance data.
+
+        Returns:
+            Root instance node.
+
+        Raises:
+            EndOfInput: If the JSON text is incomplete.
+            UnexpectedInput: If the JSON text is invalid.
+            RawMemberError: If an object member is not defined in the
+                schema.
+            RawTypeError: If a value is of incorrect type.
+        """
+        parser = JSONStreamParser(fp)
+        cooked = self.schema._cook_stream(parser)
+        if not parser.at_end():
+            raise UnexpectedInput(parser, "end of input")
+        return RootNode(cooked, self.schema, cooked.timestamp)
+
     def get_schema_node(self, path: SchemaPath) -> Optional[SchemaNode]:
         """Return the schema node addressed by a schema path.
 
@@ -144,6 +248,34 @@ class DataModel:
                 return None
         return node
 
+    def constraint_dependencies(
+            self, path: SchemaPath) -> Optional[Dict[str, Any]]:
+        """Return dependencies of XPath expressions of a schema node.
+
+        Args:
+            path: Schema path of the node.
+
+        Returns:
+            Dictionary that may contain the following entries: "when"
+            for the "when" expression, "must" with a list containing
+            an item for every "must" expression, and "path" for the
+            path of a leafref. Each dependency is a sorted list of data
+            paths of nodes that the expression may access, or ``None``
+            if it may access any node. ``None`` is returned if the
+            schema node doesn't exist.
+
+        Raises:
+            InvalidSchemaPath: If the schema path is invalid.
+        """
+        sn = self.get_schema_node(path)
+        if sn is None:
+            return None
+        res = {}
+        for k, deps in sn._xpath_deps.items():
+            res[k] = ([self._dep_paths(d) for d in deps] if k == "must"
+                      else self._dep_paths(deps))
+        return res
+
     def ascii_tree(self, no_types: bool = False) -> str:
         """Generate ASCII art representation of the schema tree.
 
@@ -171,6 +303,46 @@ class DataModel:
         res["config"] = True
         return json.dumps(res)
 
+    def _set_description(self, description: Optional[str]) -> None:
+        self.schema.description = description if description else (
+            "Data model ID: " +
+            self.yang_library["ietf-yang-library:modules-state"]
+            ["module-set-id"])
+
+    @staticmethod
+    def _dep_paths(deps: FrozenSet[Optional[SchemaNode]]
+                   ) -> Optional[List[DataPath]]:
+        if None in deps:
+            return None
+        return sorted(set([d.data_path() for d in deps
+                           if isinstance(d, DataNode)]))
+
+    @classmethod
+    def _cache_key(cls, yltxt: str, mod_path: List[str]) -> Optional[str]:
+        """Compute the key identifying valid cache contents.
+
+        The key is a digest of YANG library data and contents of all
+        (sub)module files it refers to, or ``None`` if it cannot be
+        computed.
+        """
+        try:
+            ylib = json.loads(yltxt)
+            mods = ylib["ietf-yang-library:modules-state"]["module"]
+            dig = hashlib.sha1("{}:{}".format(
+                cls.cache_format, json.dumps(ylib, sort_keys=True)).encode())
+            for item in mods:
+                mids = [(item["name"], item["revision"])] + [
+                    (s["name"], s["revision"])
+                    for s in item.get("submodule", [])]
+                for mid in mids:
+                    fn = SchemaData.module_file(mod_path, *mid)
+                    with open(fn, "rb") as infile:
+                        dig.update(infile.read())
+        except (ValueError, KeyError, TypeError, AttributeError,
+                ModuleNotFound, OSError):
+            return None
+        return dig.hexdigest()
+
     def _build_schema(self) -> None:
         for mid in self.schema_data._module_sequence:
             sctx = SchemaContext(
@@ -185,3 +357,6 @@ class DataModel:
                 self.schema._augment_stmt(aug, sctx)
         self.schema._post_process()
         self.schema._make_schema_patterns()
+        self.unresolved_steps = []
+        self.schema._bind_xpath(self.unresolved_steps)
+        self.schema._freeze()
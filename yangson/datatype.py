@@ -50,12 +50,14 @@ import numbers
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 from .constraint import Intervals, Pattern
+from .enumerations import Axis
 from .exceptions import (
     InvalidArgument, ParserException, ModuleNotRegistered, UnknownPrefix)
 from .schemadata import SchemaContext
 from .instance import InstanceNode, InstanceIdParser, InstanceRoute
 from .statement import Statement
 from .typealiases import QualName, RawScalar, ScalarValue, YangIdentifier
+from .xpathast import Expr, LocationPath, Root, Step
 from .xpathparser import XPathParser
 
 
@@ -499,11 +501,42 @@ class LeafrefType(LinkType):
         super().__init__(sctx, name)
         self.path = None
         self.ref_type = None
+        self._anchor = None  # type: Optional[Expr]
+        """Initial part of a path that ends with plain child steps."""
 
     def _handle_properties(self, stmt: Statement, sctx: SchemaContext) -> None:
         super()._handle_properties(stmt, sctx)
         self.path = XPathParser(
             stmt.find1("path", required=True).argument, sctx).parse()
+        self._anchor = self._path_anchor()
+
+    def _path_anchor(self) -> Optional[Expr]:
+        """Return the anchor part of the receiver's path.
+
+        The anchor is either the root or a sequence of parent steps,
+        and it has to be followed by child steps without predicates.
+        All targets are then determined by the node selected by the
+        anchor. ``None`` is returned for other paths.
+        """
+        xp = self.path
+        tail = False
+        while (isinstance(xp, LocationPath) and xp.right.axis == Axis.child
+               and not xp.right.predicates):
+            xp = xp.left
+            tail = True
+        if not tail:
+            return None
+        if isinstance(xp, Root):
+            return xp
+        head = xp
+        while isinstance(xp, LocationPath):
+            if xp.right.axis != Axis.parent or xp.right.predicates:
+                return None
+            xp = xp.left
+        if (isinstance(xp, Step) and xp.axis == Axis.parent and
+                not xp.predicates):
+            return head
+        return None
 
     def canonical_string(self, val: ScalarValue) -> Optional[str]:
         return self.ref_type.canonical_string(val)
@@ -42,6 +42,17 @@ class ValidationScope(Enum):
     """Both syntax and semantics."""
 
 
+class TimestampMode(Enum):
+    """Enumeration of modes for timestamps of instance values."""
+
+    datetime = 1
+    """Current local time as a ``datetime.datetime`` object."""
+    epoch = 2
+    """Current time as seconds since the epoch (float)."""
+    revision = 3
+    """Value of a monotonic integer revision counter."""
+
+
 class DefaultDeny(Enum):
     """Enumeration of NACM default deny values."""
 
@@ -335,6 +335,17 @@ class RawTypeError(RawDataError):
 class ValidationError(YangsonException):
     """Abstract exception class for instance validation errors."""
 
+    error_tags = {
+        "instance-required": "data-missing",
+        "list-key-missing": "data-missing",
+        "member-not-allowed": "unknown-element",
+        "missing-data": "data-missing",
+    }
+    """Error tags of NETCONF/RESTCONF errors for specific tags."""
+
+    default_error_tag = "operation-failed"
+    """Error tag of NETCONF/RESTCONF errors for other tags."""
+
     def __init__(self, path: JSONPointer, tag: str, message: str = None):
         self.path = path
         self.tag = tag
@@ -344,10 +355,16 @@ class ValidationError(YangsonException):
         msg = ": " + self.message if self.message else ""
         return "[{}] {}{}".format(self.path, self.tag, msg)
 
+    @property
+    def error_tag(self) -> str:
+        """Error tag of the corresponding NETCONF/RESTCONF error."""
+        return self.error_tags.get(self.tag, self.default_error_tag)
+
 
 class SchemaError(ValidationError):
     """An instance violates a schema constraint."""
-    pass
+
+    default_error_tag = "invalid-value"
 
 
 class SemanticError(ValidationError):
@@ -31,15 +31,17 @@ This module implements the following classes:
 
 from datetime import datetime
 import json
-from typing import Dict, List, Optional, Tuple, Union
+import multiprocessing
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple, Union
 from urllib.parse import unquote
 from .enumerations import ContentType, ValidationScope
 from .exceptions import (BadSchemaNodeType, EndOfInput, InstanceException,
                          InstanceValueError, InvalidKeyValue,
                          NonexistentInstance, NonDataNode,
-                         NonexistentSchemaNode, UnexpectedInput)
-from .instvalue import (ArrayValue, InstanceKey,
-                        ObjectValue, Value, ScalarValue, StructuredValue)
+                         NonexistentSchemaNode, UnexpectedInput,
+                         ValidationError)
+from .instvalue import (ArrayValue, InstanceKey, ObjectValue, Value,
+                        ScalarValue, StructuredValue, new_timestamp)
 from .parser import Parser
 from .typealiases import (InstanceName, JSONPointer, QualName, RawValue,
                           SchemaRoute, _Singleton, YangIdentifier)
@@ -52,6 +54,8 @@ __all__ = ["InstanceNode", "RootNode", "ObjectMember", "ArrayEntry",
 class LinkedList:
     """Persistent linked list of instance values."""
 
+    __slots__ = ("head", "tail")
+
     @classmethod
     def from_list(cls, vals: List[Value] = [], reverse: bool = False) -> "LinkedList":
         """Create an instance from a standard list.
@@ -82,7 +86,7 @@ class LinkedList:
             try:
                 n, cdr = cdr.pop()
             except IndexError:
-                raise StopIteration from None
+                return
             yield n
 
     def cons(self, val: Value) -> "LinkedList":
@@ -106,6 +110,8 @@ class LinkedList:
 class EmptyList(LinkedList, metaclass=_Singleton):
     """Singleton class representing the empty linked list."""
 
+    __slots__ = ()
+
     def __init__(self):
         pass
 
@@ -122,6 +128,8 @@ class EmptyList(LinkedList, metaclass=_Singleton):
 class InstanceNode:
     """YANG data node instance implemented as a zipper structure."""
 
+    __slots__ = ("path", "parinst", "schema_node", "timestamp", "value")
+
     def __init__(self, key: InstanceKey, value: Value,
                  parinst: Optional["InstanceNode"],
                  schema_node: "DataNode", timestamp: datetime):
@@ -183,7 +191,7 @@ class InstanceNode:
                     yield en
                     en = en.next()
             except NonexistentInstance:
-                raise StopIteration from None
+                return
         if isinstance(self.value, ArrayValue):
             return it()
         if isinstance(self.value, ObjectValue):
@@ -215,6 +223,8 @@ class InstanceNode:
         if not isinstance(self.value, ObjectValue):
             raise InstanceValueError(self.json_pointer(), "member of non-object")
         csn = self._member_schema_node(name)
+        if csn._iname == name:
+            name = csn._iname
         newval = self.value.copy()
         newval[name] = csn.from_raw(value, self.json_pointer()) if raw else value
         return self._copy(newval)._member(name)
@@ -306,18 +316,61 @@ class InstanceNode:
         return val
 
     def validate(self, scope: ValidationScope = ValidationScope.all,
-                 ctype: ContentType = ContentType.config) -> None:
+                 ctype: ContentType = ContentType.config,
+                 previous: "InstanceNode" = None) -> None:
         """Validate the receiver's value.
 
+        If `previous` is given, it has to be an earlier version of the
+        receiver that was successfully validated with the same `scope`
+        and `ctype`. Subtrees that are shared with it are then checked
+        only for constraints that depend on nodes outside them.
+
         Args:
             scope: Scope of the validation (syntax, semantics or all).
             ctype: Receiver's content type.
+            previous: Previously validated version of the receiver.
 
         Raises:
             SchemaError: If the value doesn't conform to the schema.
             SemanticError: If the value violates a semantic constraint.
         """
-        self.schema_node._validate(self, scope, ctype)
+        self.schema_node._validate(
+            self, scope, ctype, ValidationContext(),
+            self._previous_value(previous))
+
+    def validation_errors(self, scope: ValidationScope = ValidationScope.all,
+                          ctype: ContentType = ContentType.config,
+                          previous: "InstanceNode" = None,
+                          max_errors: int = None) -> List[ValidationError]:
+        """Validate the receiver's value and return all errors found.
+
+        As opposed to :meth:`validate`, the validation continues after
+        an error is found, until `max_errors` errors are collected.
+
+        Args:
+            scope: Scope of the validation (syntax, semantics or all).
+            ctype: Receiver's content type.
+            previous: Previously validated version of the receiver.
+            max_errors: Maximum number of errors (``None`` means no
+                limit).
+
+        Returns:
+            List of validation errors in the order in which they were
+            found. It is empty if the validation succeeds.
+        """
+        vctx = ValidationContext(True, max_errors)
+        try:
+            self.schema_node._validate(
+                self, scope, ctype, vctx, self._previous_value(previous))
+        except ValidationError as e:
+            if not (vctx.errors and vctx.errors[-1] is e):
+                vctx.errors.append(e)
+        return vctx.errors
+
+    def _previous_value(self, previous: Optional["InstanceNode"]) -> Value:
+        """Return the value of a previous version of the receiver."""
+        return (previous.value if previous is not None and
+                previous.schema_node is self.schema_node else None)
 
     def add_defaults(self, ctype: ContentType = None) -> "InstanceNode":
         """Return the receiver with defaults added recursively to its value.
@@ -346,12 +399,42 @@ class InstanceNode:
             return [en.raw_value() for en in self]
         return self.schema_node.type.to_raw(self.value)
 
-    def _member(self, name: InstanceName) -> "ObjectMember":
-        sibs = self.value.copy()
+    def iter_json_chunks(self,
+                         indent: Union[int, str] = None) -> Iterator[str]:
+        """Generate JSON text representing the receiver's value.
+
+        The text is produced directly from the cooked value, in pieces
+        that typically correspond to structured values or list entries.
+
+        Args:
+            indent: Indentation of nested objects and arrays, with the
+                same meaning as in :func:`json.dumps`. If it is
+                ``None``, no newlines are added.
+        """
+        if isinstance(indent, int):
+            indent = " " * indent
+        sn = self.schema_node
+        return (sn._entry_json_chunks(self.value, indent, "\n")
+                if isinstance(self, ArrayEntry) else
+                sn._json_chunks(self.value, indent, "\n"))
+
+    def write_json(self, fp: TextIO, indent: Union[int, str] = None) -> None:
+        """Write JSON text representing the receiver's value to a file.
+
+        Args:
+            fp: Text file open for writing.
+            indent: Indentation of nested objects and arrays (see
+                :meth:`iter_json_chunks`).
+        """
+        fp.writelines(self.iter_json_chunks(indent))
+
+    def _member(self, name: InstanceName,
+                sn: "DataNode" = None) -> "ObjectMember":
         try:
             return ObjectMember(
-                name, sibs, sibs.pop(name), self,
-                self._member_schema_node(name), self.value.timestamp)
+                name, self.value, self.value[name], self,
+                sn if sn else self._member_schema_node(name),
+                self.value.timestamp)
         except KeyError:
             raise NonexistentInstance(
                 self.json_pointer(), "member '{}'".format(name)) from None
@@ -360,10 +443,8 @@ class InstanceNode:
         val = self.value
         try:
             i = len(val) + index if index < 0 else index
-            return ArrayEntry(i, LinkedList.from_list(val[:i], reverse=True),
-                              LinkedList.from_list(val[i + 1:]),
-                              val[index], self, self.schema_node,
-                              val.timestamp)
+            return ArrayEntry(i, None, None, val[index], self,
+                              self.schema_node, val.timestamp, val)
         except (IndexError, TypeError):
             raise NonexistentInstance(self.json_pointer(), "entry " + str(index)) from None
 
@@ -381,10 +462,11 @@ class InstanceNode:
     def _member_schema_node(self, name: InstanceName) -> "DataNode":
         if name.startswith("@"):
             return self.schema_node.schema_root()
-        qname = self.schema_node._iname2qname(name)
-        res = self.schema_node.get_data_child(*qname)
+        res = self.schema_node._member_child(name)
         if res is None:
-            raise NonexistentSchemaNode(self.schema_node.qual_name, *qname)
+            raise NonexistentSchemaNode(
+                self.schema_node.qual_name,
+                *self.schema_node._iname2qname(name))
         return res
 
     def _node_set(self) -> List["InstanceNode"]:
@@ -455,6 +537,8 @@ class InstanceNode:
 class RootNode(InstanceNode):
     """This class represents the root of the instance tree."""
 
+    __slots__ = ("name", "key")
+
     def __init__(self, value: Value, schema_node: "DataNode",
                  timestamp: datetime):
         self.path = ()
@@ -472,6 +556,114 @@ class RootNode(InstanceNode):
         """
         raise NonexistentInstance(self.json_pointer(), "up of top")
 
+    def validate(self, scope: ValidationScope = ValidationScope.all,
+                 ctype: ContentType = ContentType.config,
+                 previous: InstanceNode = None, workers: int = 1) -> None:
+        """Extend the superclass method.
+
+        Top-level members are distributed among `workers` processes
+        that validate them in parallel. Entries of top-level lists and
+        leaf-lists are split into several parts, too. If validation
+        fails, the exception is the same as with a single process.
+
+        Args:
+            scope: Scope of the validation (syntax, semantics or all).
+            ctype: Receiver's content type.
+            previous: Previously validated version of the receiver.
+            workers: Number of worker processes.
+
+        Raises:
+            SchemaError: If the value doesn't conform to the schema.
+            SemanticError: If the value violates a semantic constraint.
+        """
+        tasks = self._validation_tasks(workers)
+        if len(tasks) < 2:
+            super().validate(scope, ctype, previous)
+            return
+        self._validate_parallel(tasks, workers, scope, ctype, previous,
+                                ValidationContext())
+
+    def validation_errors(self, scope: ValidationScope = ValidationScope.all,
+                          ctype: ContentType = ContentType.config,
+                          previous: InstanceNode = None,
+                          max_errors: int = None,
+                          workers: int = 1) -> List[ValidationError]:
+        """Extend the superclass method.
+
+        Parts of the receiver are validated in parallel as in
+        :meth:`validate`, and their errors are merged in the same order
+        as with a single process.
+
+        Args:
+            scope: Scope of the validation (syntax, semantics or all).
+            ctype: Receiver's content type.
+            previous: Previously validated version of the receiver.
+            max_errors: Maximum number of errors (``None`` means no
+                limit).
+            workers: Number of worker processes.
+
+        Returns:
+            List of validation errors. It is empty if the validation
+            succeeds.
+        """
+        tasks = self._validation_tasks(workers)
+        if len(tasks) < 2:
+            return super().validation_errors(
+                scope, ctype, previous, max_errors)
+        vctx = ValidationContext(True, max_errors)
+        try:
+            self._validate_parallel(tasks, workers, scope, ctype, previous,
+                                    vctx)
+        except ValidationError as e:
+            if not (vctx.errors and vctx.errors[-1] is e):
+                vctx.errors.append(e)
+        return vctx.errors
+
+    def _validation_tasks(self, workers: int) -> List[Tuple]:
+        """Return parts of the receiver to be validated by `workers`."""
+        tasks = []
+        for name in (self.value if workers > 1 else ()):
+            val = self.value[name]
+            csn = self.schema_node._member_child(name)
+            if (isinstance(csn, SequenceNode) and
+                    isinstance(val, ArrayValue) and len(val) > 1):
+                tasks.append((name, ()))
+                step = -(-len(val) // workers)
+                tasks.extend([(name, (i, min(i + step, len(val))))
+                              for i in range(0, len(val), step)])
+            else:
+                tasks.append((name, None))
+        return tasks
+
+    def _validate_parallel(self, tasks: List[Tuple], workers: int,
+                           scope: ValidationScope, ctype: ContentType,
+                           previous: Optional[InstanceNode],
+                           vctx: "ValidationContext") -> None:
+        """Validate `tasks` in worker processes.
+
+        Errors found by the workers are passed to `vctx` in the order
+        of tasks.
+        """
+        sn = self.schema_node
+        prev = self._previous_value(previous)
+        if (scope.value & ValidationScope.syntax.value and
+                not (self.value is prev and sn._when_reach == 0)):
+            try:
+                sn._check_schema_pattern(self, ctype)
+            except ValidationError as e:
+                vctx.report(e)
+        with multiprocessing.Pool(
+                min(workers, len(tasks)), _init_validation_worker,
+                (self, prev, scope, ctype, vctx.errors is not None,
+                 vctx.max_errors)) as pool:
+            res = pool.map(_validate_part, tasks, 1)
+        for task, errs in zip(tasks, res):
+            if errs is True:       # unexpected exception, raise it here
+                _validate_part(task, (self, prev, scope, ctype, vctx))
+                continue
+            for err in errs:
+                vctx.report(err[0](*err[1:]))
+
     def _copy(self, newval: Value, newts: datetime = None) -> InstanceNode:
         return RootNode(
             newval, self.schema_node, newts if newts else newval.timestamp)
@@ -490,12 +682,14 @@ class RootNode(InstanceNode):
 class ObjectMember(InstanceNode):
     """This class represents an object member."""
 
+    __slots__ = ("siblings",)
+
     def __init__(self, key: InstanceName, siblings: Dict[InstanceName, Value],
                  value: Value, parinst: Optional[InstanceNode],
                  schema_node: "DataNode", timestamp: datetime):
         super().__init__(key, value, parinst, schema_node, timestamp)
         self.siblings = siblings  # type: Dict[InstanceName, Value]
-        """Sibling members within the parent object."""
+        """Parent object (with the original value of the receiver)."""
 
     @property
     def key(self) -> InstanceName:
@@ -509,6 +703,9 @@ class ObjectMember(InstanceNode):
     @property
     def qual_name(self) -> QualName:
         """Return the receiver's qualified name."""
+        sn = self.schema_node
+        if sn._iname == self.name:
+            return sn._qname
         p, s, loc = self.name.partition(":")
         return (loc, p) if s else (p, self.namespace)
 
@@ -524,11 +721,9 @@ class ObjectMember(InstanceNode):
             NonexistentInstance: If sibling member `name` doesn't exist.
         """
         ssn = self.parinst._member_schema_node(name)
+        sibs = self._zip()
         try:
-            sibs = self.siblings.copy()
-            newval = sibs.pop(name)
-            sibs[self.name] = self.value
-            return ObjectMember(name, sibs, newval, self.parinst,
+            return ObjectMember(name, sibs, sibs[name], self.parinst,
                                 ssn, self.timestamp)
         except KeyError:
             raise NonexistentInstance(
@@ -546,6 +741,19 @@ class ObjectMember(InstanceNode):
         """
         if not isinstance(self.schema_node, ListNode):
             raise InstanceValueError(self.json_pointer(), "lookup on non-list")
+        kms = self.schema_node._key_members
+        if (isinstance(self.value, ArrayValue) and kms and
+                len(keys) == len(kms) and all([k in keys for k in kms])):
+            try:
+                i = self.value.key_lookup(tuple(kms),
+                                          tuple([keys[k] for k in kms]))
+            except TypeError:                 # unhashable key value
+                pass
+            else:
+                if i is None:
+                    raise NonexistentInstance(self.json_pointer(),
+                                              "entry lookup failed")
+                return self._entry(i)
         try:
             for i in range(len(self.value)):
                 en = self.value[i]
@@ -563,8 +771,16 @@ class ObjectMember(InstanceNode):
             raise InstanceValueError(self.json_pointer(), "lookup on non-list") from None
 
     def _zip(self) -> ObjectValue:
-        """Zip the receiver into an object and return it."""
-        res = ObjectValue(self.siblings.copy(), self.timestamp)
+        """Zip the receiver into an object and return it.
+
+        The parent object is copied only if the receiver's value was
+        changed.
+        """
+        sibs = self.siblings
+        if (isinstance(sibs, ObjectValue) and
+                sibs.get(self.name, sibs) is self.value):
+            return sibs
+        res = ObjectValue(sibs, self.timestamp)
         res[self.name] = self.value
         return res
 
@@ -574,7 +790,7 @@ class ObjectMember(InstanceNode):
         elif isinstance(newval, StructuredValue):
             ts = newval.timestamp
         else:
-            ts = datetime.now()
+            ts = new_timestamp()
         return ObjectMember(self.name, self.siblings, newval, self.parinst,
                             self.schema_node, ts)
 
@@ -593,14 +809,32 @@ class ObjectMember(InstanceNode):
 class ArrayEntry(InstanceNode):
     """This class represents an array entry."""
 
-    def __init__(self, key: int, before: LinkedList, after: LinkedList,
-                 value: Value, parinst: Optional[InstanceNode],
-                 schema_node: "DataNode", timestamp: datetime = None):
+    __slots__ = ("_before", "_after", "_array")
+
+    def __init__(self, key: int, before: Optional[LinkedList],
+                 after: Optional[LinkedList], value: Value,
+                 parinst: Optional[InstanceNode], schema_node: "DataNode",
+                 timestamp: datetime = None, array: ArrayValue = None):
         super().__init__(key, value, parinst, schema_node, timestamp)
-        self.before = before  # type: LinkedList
+        self._before = before  # type: Optional[LinkedList]
+        self._after = after  # type: Optional[LinkedList]
+        self._array = array  # type: Optional[ArrayValue]
+        """Parent array, or ``None`` if `before` and `after` are given."""
+
+    @property
+    def before(self) -> LinkedList:
         """Preceding entries of the parent array."""
-        self.after = after  # type: LinkedList
+        if self._before is None:
+            self._before = LinkedList.from_list(
+                self._array[:self.index], reverse=True)
+        return self._before
+
+    @property
+    def after(self) -> LinkedList:
         """Following entries of the parent array."""
+        if self._after is None:
+            self._after = LinkedList.from_list(self._array[self.index + 1:])
+        return self._after
 
     @property
     def key(self) -> InstanceName:
@@ -637,6 +871,13 @@ class ArrayEntry(InstanceNode):
             NonexistentInstance: If the receiver is the first entry of the
                 parent array.
         """
+        if self._in_array():
+            if self.index == 0:
+                raise NonexistentInstance(self.json_pointer(),
+                                          "previous of first")
+            return ArrayEntry(
+                self.index - 1, None, None, self._array[self.index - 1],
+                self.parinst, self.schema_node, self.timestamp, self._array)
         try:
             newval, nbef = self.before.pop()
         except IndexError:
@@ -651,6 +892,15 @@ class ArrayEntry(InstanceNode):
         Raises:
             NonexistentInstance: If the receiver is the last entry of the parent array.
         """
+        if self._in_array():
+            try:
+                newval = self._array[self.index + 1]
+            except IndexError:
+                raise NonexistentInstance(self.json_pointer(),
+                                          "next of last") from None
+            return ArrayEntry(
+                self.index + 1, None, None, newval, self.parinst,
+                self.schema_node, self.timestamp, self._array)
         try:
             newval, naft = self.after.pop()
         except IndexError:
@@ -672,7 +922,7 @@ class ArrayEntry(InstanceNode):
         """
         return ArrayEntry(self.index, self.before, self.after.cons(self.value),
                           self._cook_value(value, raw), self.parinst,
-                          self.schema_node, datetime.now())
+                          self.schema_node, new_timestamp())
 
     def insert_after(self, value: Union[RawValue, Value],
                      raw: bool = False) -> "ArrayEntry":
@@ -687,14 +937,31 @@ class ArrayEntry(InstanceNode):
         """
         return ArrayEntry(self.index, self.before.cons(self.value), self.after,
                           self._cook_value(value, raw), self.parinst,
-                          self.schema_node, datetime.now())
+                          self.schema_node, new_timestamp())
 
     def _cook_value(self, value: Union[RawValue, Value], raw: bool) -> Value:
-        return super(SequenceNode, self.schema_node).from_raw(
+        return self.schema_node.entry_from_raw(
             value, self.json_pointer()) if raw else value
 
+    def _in_array(self) -> bool:
+        """Return ``True`` if the receiver is unchanged in the parent array."""
+        return (self._array is not None and
+                self._array[self.index] is self.value)
+
     def _zip(self) -> ArrayValue:
-        """Zip the receiver into an array and return it."""
+        """Zip the receiver into an array and return it.
+
+        The parent array is copied only if the receiver's value was
+        changed.
+        """
+        if self._array is not None:
+            if self._array[self.index] is self.value:
+                return self._array
+            res = self._array[:]
+            res[self.index] = self.value
+            res = ArrayValue(res, self.timestamp)
+            res._inherit_index(self._array, self.index)
+            return res
         res = list(self.before)
         res.reverse()
         res.append(self.value)
@@ -707,9 +974,9 @@ class ArrayEntry(InstanceNode):
         elif isinstance(newval, StructuredValue):
             ts = newval.timestamp
         else:
-            ts = datetime.now()
-        return ArrayEntry(self.index, self.before, self.after, newval,
-                          self.parinst, self.schema_node, ts)
+            ts = new_timestamp()
+        return ArrayEntry(self.index, self._before, self._after, newval,
+                          self.parinst, self.schema_node, ts, self._array)
 
     def _ancestors_or_self(
             self, qname: Union[QualName, bool] = None) -> List[InstanceNode]:
@@ -729,7 +996,7 @@ class ArrayEntry(InstanceNode):
             return []
         res = []
         en = self
-        for _ in self.before:
+        for _ in range(self.index):
             en = en.previous()
             res.append(en)
         return res
@@ -741,10 +1008,12 @@ class ArrayEntry(InstanceNode):
             return []
         res = []
         en = self
-        for _ in self.after:
-            en = en.next()
-            res.append(en)
-        return res
+        try:
+            while True:
+                en = en.next()
+                res.append(en)
+        except NonexistentInstance:
+            return res
 
     def _parent(self) -> List["InstanceNode"]:
         """XPath - return the receiver's parent as a singleton list."""
@@ -966,6 +1235,15 @@ class EntryKeys:
             sn:  Current schema node.
         """
         keys = self.parse_keys(sn)
+        kms = sn._key_members
+        if (isinstance(val, ArrayValue) and kms and len(keys) == len(kms)
+                and all([k in keys for k in kms])):
+            try:
+                i = val.key_lookup(tuple(kms), tuple([keys[k] for k in kms]))
+            except TypeError:                 # unhashable key value
+                pass
+            else:
+                return (None if i is None else val[i], sn)
         for en in val:
             flag = True
             try:
@@ -1110,6 +1388,69 @@ class InstanceIdParser(Parser):
         return EntryKeys(sel)
 
 
+_worker_state = None
+"""Data used by a validation worker process."""
+
+
+def _init_validation_worker(root: RootNode, prev: Value,
+                            scope: ValidationScope, ctype: ContentType,
+                            collect: bool, max_errors: Optional[int]) -> None:
+    """Initialize a process for parallel validation."""
+    global _worker_state
+    _worker_state = (root, prev, scope, ctype,
+                     ValidationContext(collect, max_errors))
+
+
+def _validate_part(task: Tuple[InstanceName, Optional[Tuple[int, ...]]],
+                   state: Tuple = None) -> Union[None, bool, List[Tuple]]:
+    """Validate a part of a top-level member.
+
+    Args:
+        task: Name of the member and the part to validate: ``None``
+            for the entire member, empty tuple for constraints of the
+            entire array, or range of array entries.
+        state: Root node, previous value, validation scope, content
+            type and validation context. If it is ``None``, the
+            data of the worker process are used.
+
+    Returns:
+        In a worker process, a list of tuples with the class and
+        arguments of validation errors found in the part, or ``True``
+        if another exception was raised.
+    """
+    root, prev, scope, ctype, vctx = state if state else _worker_state
+    name, part = task
+    pval = prev.get(name) if isinstance(prev, ObjectValue) else None
+    errs = []
+    if not state and vctx.errors is not None:
+        vctx.errors = errs
+    try:
+        mi = root._member(name)
+        sn = mi.schema_node
+        if part is None:
+            sn._validate(mi, scope, ctype, vctx, pval)
+        elif mi.value is not pval or sn._reach != 0:
+            pents = sn._previous_entries(pval)
+            if not part:
+                if mi.value is not pval:
+                    sn._check_array(mi, scope, vctx, pents)
+            else:
+                sn._validate_entries(mi, scope, ctype, vctx, pents, *part)
+    except ValidationError as e:
+        if state:
+            raise
+        if not (errs and errs[-1] is e):
+            errs.append(e)
+    except Exception:
+        if state:
+            raise
+        return True
+    if state:
+        return None
+    return [(type(e), e.path, e.tag, e.message) for e in errs]
+
+
 from .schemanode import (AnydataNode, CaseNode, ChoiceNode, DataNode,       # NOQA
                          InternalNode, LeafNode, LeafListNode, ListNode,
-                         RpcActionNode, SequenceNode, TerminalNode)
+                         RpcActionNode, SequenceNode, TerminalNode,
+                         ValidationContext)
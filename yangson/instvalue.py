@@ -22,10 +22,19 @@ This module implements the following classes:
 * StructuredValue: Abstract class for structured values of instance nodes.
 * ArrayValue: Cooked array value of an instance node.
 * ObjectValue: Cooked object value of an instance node.
+
+and functions:
+
+* set_timestamp_mode: Select the kind of timestamps of instance values.
+* new_timestamp: Return a timestamp for a new or modified value.
 """
 
+import itertools
+import time
 from datetime import datetime
-from typing import Dict, List, Union
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple, Union
+from .enumerations import TimestampMode
 from .typealiases import InstanceName, ScalarValue
 
 # Type aliases
@@ -39,24 +48,65 @@ InstanceKey = Union[InstanceName, int]
 """Index of an array entry or name of an object member."""
 
 
+_revision = itertools.count(1)
+"""Revision counter used in the ``revision`` timestamp mode."""
+
+_clock = datetime.now
+"""Function returning timestamps in the current mode."""
+
+
+def set_timestamp_mode(mode: TimestampMode) -> None:
+    """Select the kind of timestamps assigned to instance values.
+
+    The mode applies to all values created or modified afterwards in
+    the current process, so it should be selected before any instance
+    data are created: timestamps of different kinds cannot be compared.
+
+    Args:
+        mode: Timestamp mode.
+    """
+    global _clock
+    if mode == TimestampMode.epoch:
+        _clock = time.time
+    elif mode == TimestampMode.revision:
+        _clock = partial(next, _revision)
+    else:
+        _clock = datetime.now
+
+
+def new_timestamp() -> Any:
+    """Return a timestamp for a new or modified instance value."""
+    return _clock()
+
+
 class StructuredValue:
     """Abstract class for array and object values."""
 
+    _hash = None  # type: Optional[int]
+    """Cached hash value (``None`` if not computed yet)."""
+
     def __init__(self, ts: datetime):
         """Initialize class instance.
 
         Args:
         :param ts: creation timestamp
         """
-        self.timestamp = ts if ts else datetime.now()
+        self.timestamp = ts if ts else _clock()
 
     def copy(self) -> "StructuredValue":
         """Return a shallow copy of the receiver."""
-        return self.__class__(super().copy(), datetime.now())
+        res = self.__class__(super().copy(), _clock())
+        res._hash = self._hash
+        return res
 
     def __setitem__(self, key: InstanceKey, value: Value) -> None:
         super().__setitem__(key, value)
-        self.timestamp = datetime.now()
+        self._invalidate()
+        self.timestamp = _clock()
+
+    def __delitem__(self, key: InstanceKey) -> None:
+        super().__delitem__(key)
+        self._invalidate()
 
     def __eq__(self, val: "StructuredValue") -> bool:
         """Return ``True`` if the receiver equal to `val`.
@@ -64,10 +114,34 @@ class StructuredValue:
         Args:
         :param val: value to compare
         """
-        return self.__class__ == val.__class__ and hash(self) == hash(val)
+        return self is val or (
+            self.__class__ == val.__class__ and hash(self) == hash(val))
 
     def __hash__(self) -> int:
-        """Return hash value for the receiver."""
+        """Return hash value for the receiver.
+
+        The hash value is computed only once and then cached until the
+        receiver is modified.
+        """
+        if self._hash is None:
+            self._hash = self._compute_hash()
+        return self._hash
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Return the receiver's state for pickling.
+
+        Hash values of strings differ between processes, so the
+        cached hash value mustn't be pickled.
+        """
+        res = self.__dict__.copy()
+        res.pop("_hash", None)
+        return res
+
+    def _invalidate(self) -> None:
+        """Discard data cached for the current contents of the receiver."""
+        self._hash = None
+
+    def _compute_hash(self) -> int:
         raise NotImplementedError()
 
 
@@ -77,9 +151,93 @@ class ArrayValue(StructuredValue, list):
     def __init__(self, val: List[EntryValue] = [], ts: datetime=None):
         StructuredValue.__init__(self, ts)
         list.__init__(self, val)
+        self._index = None  # type: Optional[Tuple[Tuple[InstanceName, ...], Dict[Tuple[ScalarValue, ...], int]]]
+        """Key index (key names + map of key values to entry indices)."""
 
-    def __hash__(self) -> int:
-        """Return hash value for the receiver."""
+    def __iadd__(self, val: List[EntryValue]) -> "ArrayValue":
+        self._invalidate()
+        return super().__iadd__(val)
+
+    def __imul__(self, n: int) -> "ArrayValue":
+        self._invalidate()
+        return super().__imul__(n)
+
+    def append(self, value: EntryValue) -> None:
+        self._invalidate()
+        super().append(value)
+
+    def clear(self) -> None:
+        self._invalidate()
+        super().clear()
+
+    def extend(self, val: List[EntryValue]) -> None:
+        self._invalidate()
+        super().extend(val)
+
+    def insert(self, key: int, value: EntryValue) -> None:
+        self._invalidate()
+        super().insert(key, value)
+
+    def pop(self, key: int = -1) -> EntryValue:
+        self._invalidate()
+        return super().pop(key)
+
+    def remove(self, value: EntryValue) -> None:
+        self._invalidate()
+        super().remove(value)
+
+    def reverse(self) -> None:
+        self._invalidate()
+        super().reverse()
+
+    def sort(self, *args, **kwargs) -> None:
+        self._invalidate()
+        super().sort(*args, **kwargs)
+
+    def _invalidate(self) -> None:
+        super()._invalidate()
+        self._index = None
+
+    def key_lookup(self, keys: Tuple[InstanceName, ...],
+                   kval: Tuple[ScalarValue, ...]) -> Optional[int]:
+        """Return index of the first entry with the given key values.
+
+        The index of entries is built upon first use, and then reused
+        until the receiver is modified.
+
+        Args:
+            keys: Instance names of key members.
+            kval: Key values (in the same order as `keys`).
+
+        Returns:
+            Index of the entry, or ``None`` if no entry matches.
+        """
+        if self._index is None or self._index[0] != keys:
+            idx = {}
+            for i in range(len(self)):
+                try:
+                    idx.setdefault(tuple([self[i][k] for k in keys]), i)
+                except (KeyError, TypeError):
+                    continue
+            self._index = (keys, idx)
+        return self._index[1].get(kval)
+
+    def _inherit_index(self, array: "ArrayValue", i: int) -> None:
+        """Reuse the key index of `array` if it is still valid.
+
+        The receiver has to be a copy of `array` in which only the
+        `i`-th entry was replaced.
+        """
+        if array._index is None:
+            return
+        keys = array._index[0]
+        try:
+            if all([self[i][k] == array[i][k] for k in keys]):
+                self._index = array._index
+        except (KeyError, TypeError):
+            pass
+
+    def _compute_hash(self) -> int:
         return tuple([x.__hash__() for x in self]).__hash__()
 
 
@@ -91,7 +249,30 @@ class ObjectValue(StructuredValue, dict):
         StructuredValue.__init__(self, ts)
         dict.__init__(self, val)
 
-    def __hash__(self) -> int:
-        """Return hash value for the receiver."""
+    def __ior__(self, val: Dict[InstanceName, Value]) -> "ObjectValue":
+        self._invalidate()
+        return super().__ior__(val)
+
+    def clear(self) -> None:
+        self._invalidate()
+        super().clear()
+
+    def pop(self, key: InstanceName, *default: Value) -> Value:
+        self._invalidate()
+        return super().pop(key, *default)
+
+    def popitem(self) -> Tuple[InstanceName, Value]:
+        self._invalidate()
+        return super().popitem()
+
+    def setdefault(self, key: InstanceName, default: Value = None) -> Value:
+        self._invalidate()
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs) -> None:
+        self._invalidate()
+        super().update(*args, **kwargs)
+
+    def _compute_hash(self) -> int:
         sks = sorted(self.keys())
         return tuple([(k, self[k].__hash__()) for k in sks]).__hash__()
@@ -17,9 +17,10 @@
 
 """XPath node-set"""
 
-from typing import Callable, Union
+from typing import Callable, Set, Tuple, Union
 from numbers import Number
 from .instance import InstanceNode
+from .instvalue import InstanceKey
 
 # Type aliases
 
@@ -43,15 +44,28 @@ def comparison(meth):
 class NodeSet(list):
 
     def union(self, ns: "NodeSet") -> "NodeSet":
-        paths = set([n.path for n in self])
-        return self.__class__(self + [n for n in ns if n.path not in paths])
+        res = self.__class__(self)
+        res._add_new(ns, set([n.path for n in self]))
+        return res
 
     def bind(self, trans: NodeExpr) -> "NodeSet":
         res = self.__class__([])
+        paths = set()
         for n in self:
-            res = res.union(trans(n))
+            res._add_new(trans(n), paths)
         return res
 
+    def _add_new(self, ns: "NodeSet",
+                 paths: Set[Tuple[InstanceKey, ...]]) -> None:
+        """Append nodes from `ns` whose paths are not in `paths` yet.
+
+        The set `paths` is updated with paths of the appended nodes.
+        """
+        for n in ns:
+            if n.path not in paths:
+                paths.add(n.path)
+                self.append(n)
+
     def __float__(self) -> float:
         return float(self[0].value)
 
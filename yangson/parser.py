@@ -17,16 +17,19 @@
 
 """Simple recursive-descent parser.
 
-This module implements the following class:
+This module implements the following classes:
 
 * Parser: Recursive-descent parser.
+* JSONStreamParser: Incremental parser of JSON text.
 """
 
+from json import JSONDecoder
+from json.scanner import make_scanner
 import re
-from typing import Callable, List, Dict, Optional, Tuple
-from typing.re import Pattern
+from typing import (Callable, Iterator, List, Dict, Optional, Pattern,
+                    TextIO, Tuple)
 from .exceptions import EndOfInput, UnexpectedInput
-from .typealiases import YangIdentifier
+from .typealiases import RawValue, YangIdentifier
 
 # Local type aliases
 TransitionTable = List[Dict[str, Callable[[], int]]]
@@ -229,3 +232,171 @@ class Parser:
             UnexpectedInput: If no syntactically correct keyword is found.
         """
         return self.match_regex(self.ident_re, True, "YANG identifier")
+
+
+class JSONStreamParser(Parser):
+    """Incremental parser of JSON text read from a file.
+
+    Only a limited window of the input text is kept in memory. The
+    parser skips whitespace between JSON tokens automatically.
+    """
+
+    _scan = make_scanner(JSONDecoder())
+    """Scanner of JSON values from the standard library."""
+
+    def __init__(self, fp: TextIO, chunk_size: int = 65536):
+        """Initialize the class instance.
+
+        Args:
+            fp: Text file containing JSON text.
+            chunk_size: Number of characters read from `fp` at once.
+        """
+        super().__init__("")
+        self.fp = fp
+        """Input file."""
+        self.chunk_size = chunk_size
+        """Number of characters read from the input file at once."""
+        self._line = 0
+        """Number of newlines in the discarded part of input."""
+        self._column = 0
+        """Column of the start of input."""
+
+    def at_end(self) -> bool:
+        """Override the superclass method.
+
+        Optional whitespace is skipped, and more input is read if
+        necessary.
+        """
+        try:
+            self.peek()
+        except EndOfInput:
+            return True
+        return False
+
+    def line_column(self) -> Tuple[int, int]:
+        """Override the superclass method."""
+        l, c = super().line_column()
+        return (self._line + l, c if l > 1 else self._column + c)
+
+    def peek(self) -> str:
+        """Override the superclass method.
+
+        Optional whitespace is skipped, and more input is read if
+        necessary.
+        """
+        while True:
+            try:
+                c = self.input[self.offset]
+                if c not in " \n\t\r":
+                    return c
+                self.offset = self.ws_re.match(self.input, self.offset).end()
+                return self.input[self.offset]
+            except IndexError:
+                if not self._read():
+                    raise EndOfInput(self) from None
+
+    def members(self) -> Iterator[str]:
+        """Parse a JSON object and yield names of its members.
+
+        The value of each member has to be parsed before the next name
+        is requested.
+        """
+        self.char("{")
+        if self.peek() == "}":
+            self.offset += 1
+            return
+        while True:
+            name = self.string()
+            self.char(":")
+            yield name
+            c = self.peek()
+            self.offset += 1
+            if c == "}":
+                return
+            if c != ",":
+                self.offset -= 1
+                raise UnexpectedInput(self, "one of ,}")
+
+    def entries(self) -> Iterator[int]:
+        """Parse a JSON array and yield indices of its entries.
+
+        Each entry has to be parsed before the next index is requested.
+        """
+        self.char("[")
+        if self.peek() == "]":
+            self.offset += 1
+            return
+        i = 0
+        while True:
+            yield i
+            i += 1
+            c = self.peek()
+            self.offset += 1
+            if c == "]":
+                return
+            if c != ",":
+                self.offset -= 1
+                raise UnexpectedInput(self, "one of ,]")
+
+    def string(self) -> str:
+        """Parse a JSON string and return its value."""
+        if self.peek() != '"':
+            raise UnexpectedInput(self, "JSON string")
+        return self.small_value()
+
+    def value(self) -> RawValue:
+        """Parse an arbitrary JSON value and return it in the raw form."""
+        c = self.peek()
+        if c == "{":
+            res = {}
+            for name in self.members():
+                res[name] = self.value()
+            return res
+        if c == "[":
+            return [self.value() for i in self.entries()]
+        return self.small_value()
+
+    def small_value(self) -> RawValue:
+        """Parse a small JSON value and return it in the raw form.
+
+        The value is parsed by the scanner from the standard library,
+        so it has to fit in the input window: more input is read and
+        the value parsed again if it may be incomplete.
+        """
+        self.peek()
+        while True:
+            try:
+                res, end = self._scan(self.input, self.offset)
+            except StopIteration as e:
+                if e.value + 6 >= len(self.input) and self._read():
+                    continue
+                raise UnexpectedInput(self, "JSON value") from None
+            except ValueError as e:
+                if ((e.msg.startswith("Unterminated") or
+                     e.pos + 6 >= len(self.input)) and self._read()):
+                    continue
+                raise UnexpectedInput(self, "JSON value") from None
+            if end + 3 > len(self.input) and self._read():
+                continue                # number may be incomplete
+            self.offset = end
+            return res
+
+    def _read(self) -> bool:
+        """Read the next chunk of input and discard the parsed text.
+
+        Returns:
+            ``False`` if the end of the input file was reached.
+        """
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            return False
+        done = self.input[:self.offset]
+        nl = done.count("\n")
+        if nl:
+            self._line += nl
+            self._column = len(done) - done.rfind("\n") - 1
+        else:
+            self._column += len(done)
+        self.input = self.input[self.offset:] + chunk
+        self.offset = 0
+        return True
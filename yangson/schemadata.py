@@ -26,6 +26,10 @@ This module implements the following classes:
 * FeatureExprParser: Parser for if-feature expressions.
 """
 
+import hashlib
+import os
+import threading
+from collections import OrderedDict
 from typing import Any, Dict, List, MutableSet, Tuple
 from .exceptions import (
     InvalidSchemaPath, BadYangLibraryData, CyclicImports, DefinitionNotFound,
@@ -84,6 +88,17 @@ class SchemaData:
             mod_path: List of directories to search for YANG modules.
     """
 
+    module_cache_size = 1024
+    """Maximum number of parsed (sub)modules kept in the module cache.
+
+    The value of ``None`` means that the cache is unbounded.
+    """
+
+    _module_cache = OrderedDict()  # type: Dict[Tuple[str, str], Statement]
+    """Process-wide cache of parsed (sub)modules."""
+
+    _module_cache_lock = threading.Lock()
+
     def __init__(self, yang_lib: Dict[str, Any], mod_path: List[str]) -> None:
         """Initialize the schema structures."""
         self.identity_adjs = {}  # type: Dict[QualName, IdentityAdjacency]
@@ -144,23 +159,69 @@ class SchemaData:
                         sdata.prefix_map[locpref] = mid
         except KeyError as e:
             raise BadYangLibraryData("missing " + str(e)) from None
+        self._trim_module_cache()
         self._process_imports()
         self._check_feature_dependences()
 
     def _load_module(self, name: YangIdentifier,
                      rev: RevisionDate) -> Statement:
-        """Read and parse a YANG module or submodule."""
-        for d in self.module_search_path:
+        """Read and parse a YANG module or submodule.
+
+        Parsed (sub)modules are kept in a process-wide cache that is
+        shared by all data models, and the file is parsed only if its
+        contents is not found there.
+        """
+        fn = self.module_file(self.module_search_path, name, rev)
+        with open(fn, encoding='utf-8') as infile:
+            text = infile.read()
+        key = (os.path.realpath(fn),
+               hashlib.sha1(text.encode("utf-8")).hexdigest())
+        cache = SchemaData._module_cache
+        with SchemaData._module_cache_lock:
+            res = cache.get(key)
+            if res is not None:
+                cache.move_to_end(key)
+                return res
+        res = ModuleParser(text).parse()
+        with SchemaData._module_cache_lock:
+            cache[key] = res
+        return res
+
+    def _trim_module_cache(self) -> None:
+        """Discard least recently used entries from the module cache.
+
+        The cache is never trimmed below the number of (sub)modules of
+        the receiver, which have just been used.
+        """
+        if SchemaData.module_cache_size is None:
+            return
+        limit = max(SchemaData.module_cache_size, len(self.modules))
+        cache = SchemaData._module_cache
+        with SchemaData._module_cache_lock:
+            while len(cache) > limit:
+                cache.popitem(last=False)
+
+    @staticmethod
+    def module_file(mod_path: List[str], name: YangIdentifier,
+                    rev: RevisionDate) -> str:
+        """Return the name of the file containing a (sub)module.
+
+        Args:
+            mod_path: List of directories where to look for YANG modules.
+            name: Name of the module or submodule.
+            rev: Revision date (may be empty).
+
+        Raises:
+            ModuleNotFound: If the module file wasn't found in any of the
+                directories specified in `mod_path`.
+        """
+        for d in mod_path:
             fn = "{}/{}".format(d, name)
             if rev:
                 fn += "@" + rev
             fn += ".yang"
-            try:
-                with open(fn, encoding='utf-8') as infile:
-                    res = ModuleParser(infile.read()).parse()
-            except FileNotFoundError:
-                continue
-            return res
+            if os.path.isfile(fn):
+                return fn
         raise ModuleNotFound(name, rev)
 
     def _process_imports(self) -> None:
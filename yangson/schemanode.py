@@ -40,22 +40,29 @@ This module implements the following classes:
 * AnydataNode: YANG anydata node.
 * AnyxmlNode: YANG anyxml node.
 * AnnotationNode: YANG extension RFC 7952 annotation node.
+* ValidationContext: Data shared by all schema nodes during validation.
 """
 
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Set, Tuple
+import json
+import sys
+from json.encoder import encode_basestring_ascii
+from typing import (Any, Dict, FrozenSet, Iterator, List, Optional, Set,
+                    Tuple)
 from .constraint import Must
 from .datatype import (DataType, LeafrefType, LinkType,
                        RawScalar, IdentityrefType)
 from .enumerations import Axis, ContentType, DefaultDeny, ValidationScope
 from .exceptions import (
-    InvalidLeafrefPath, InvalidArgument, RawMemberError, RawTypeError,
-    SchemaError, SemanticError, YangsonException)
+    InvalidLeafrefPath, InvalidArgument, NonexistentSchemaNode,
+    RawDataError, RawMemberError, RawTypeError, SchemaError, SemanticError,
+    ValidationError, YangsonException)
 from .instvalue import (
-    ArrayValue, EntryValue, ObjectValue, Value)
+    ArrayValue, EntryValue, ObjectValue, Value, new_timestamp)
+from .parser import JSONStreamParser
 from .schemadata import IdentityAdjacency, SchemaContext
 from .schpattern import (ChoicePattern, ConditionalPattern, Empty, Member,
-                         NotAllowed, Pair, SchemaPattern)
+                         NotAllowed, Pair, PatternAutomaton, SchemaPattern,
+                         Typeable)
 from .statement import Statement
 from .typealiases import (DataPath, InstanceName, JSONPointer, QualName,
                           RawEntry, RawList, RawObject, RawValue, ScalarValue,
@@ -66,6 +73,13 @@ from .xpathparser import XPathParser
 class SchemaNode:
     """Abstract class for all schema nodes."""
 
+    # ``default_deny`` belongs to DataNode, which has to stay without
+    # slots of its own because of multiple inheritance.
+    __slots__ = ("name", "ns", "parent", "description", "must", "when",
+                 "_ctype", "_frozen", "_data_parent", "_iname", "_qname",
+                 "_data_path", "_reach", "_outer_musts", "_xpath_deps",
+                 "default_deny")
+
     def __init__(self):
         """Initialize the class instance."""
         self.name = None  # type: Optional[YangIdentifier]
@@ -82,11 +96,29 @@ class SchemaNode:
         """Optional "when" expression that makes the receiver conditional."""
         self._ctype = None
         """Content type of the receiver."""
+        self._frozen = False
+        """Flag indicating that the schema tree is complete."""
+        self._data_parent = None  # type: Optional[InternalNode]
+        """Closest ancestor data node (set by freezing)."""
+        self._iname = None  # type: Optional[InstanceName]
+        """Interned instance name of the receiver (set by post-processing)."""
+        self._qname = None  # type: Optional[QualName]
+        """Qualified name of the receiver (set by post-processing)."""
+        self._data_path = None  # type: Optional[DataPath]
+        """Data path of the receiver (set by freezing)."""
+        self._reach = None  # type: Optional[int]
+        """Number of levels above the receiver's instance that are
+        accessed by validation of the instance (set by freezing)."""
+        self._outer_musts = self.must  # type: List[Must]
+        """Must expressions accessing nodes outside receiver's instance."""
+        self._xpath_deps = {}  # type: Dict[str, Any]
+        """Schema nodes that receiver's XPath expressions depend on."""
 
     @property
     def qual_name(self) -> QualName:
         """Qualified name of the receiver."""
-        return (self.name, self.ns)
+        qn = self._qname
+        return (self.name, self.ns) if qn is None else qn
 
     @property
     def config(self) -> bool:
@@ -111,6 +143,8 @@ class SchemaNode:
 
     def data_parent(self) -> Optional["InternalNode"]:
         """Return the closest ancestor data node."""
+        if self._frozen:
+            return self._data_parent
         parent = self.parent
         while parent:
             if isinstance(parent, DataNode):
@@ -119,12 +153,16 @@ class SchemaNode:
 
     def iname(self) -> InstanceName:
         """Return the instance name corresponding to the receiver."""
+        if self._iname is not None:
+            return self._iname
         dp = self.data_parent()
         return (self.name if dp and self.ns == dp.ns
                 else self.ns + ":" + self.name)
 
     def data_path(self) -> DataPath:
         """Return the receiver's data path."""
+        if self._data_path is not None:
+            return self._data_path
         dp = self.data_parent()
         return (dp.data_path() if dp else "") + "/" + self.iname()
 
@@ -144,6 +182,37 @@ class SchemaNode:
                 schema.
             RawTypeError: If a scalar value inside `rval` is of incorrect type.
         """
+        try:
+            return self._cook(rval)
+        except RawDataError as e:
+            e.path = jptr + e.path
+            raise
+
+    def _cook(self, rval: RawValue) -> Value:
+        """Transform a raw value into the cooked form.
+
+        JSON pointers in raised exceptions are relative to the
+        receiver's instance, and callers have to prepend their part.
+        """
+        raise NotImplementedError
+
+    def _cook_stream(self, parser: JSONStreamParser) -> Value:
+        """Parse a JSON value and transform it into the cooked form.
+
+        JSON pointers in raised exceptions are relative to the
+        receiver's instance, as in :meth:`_cook`.
+        """
+        return self._cook(parser.value())
+
+    def _json_chunks(self, val: Value, indent: Optional[str],
+                     nl: str) -> Iterator[str]:
+        """Generate JSON text representing a cooked value.
+
+        Args:
+            val: Cooked value of the receiver's instance.
+            indent: Indentation unit, or ``None`` for compact output.
+            nl: Newline followed by the indentation of the current line.
+        """
         raise NotImplementedError
 
     def _get_description(self, stmt: Statement):
@@ -164,13 +233,19 @@ class SchemaNode:
         return res
 
     def _validate(self, inst: "InstanceNode", scope: ValidationScope,
-                  ctype: ContentType) -> None:
+                  ctype: ContentType, vctx: "ValidationContext",
+                  prev: Value = None) -> None:
         """Validate instance against the receiver.
 
+        Constraints that depend only on the value of `inst` are not
+        checked if that value is identical to `prev`.
+
         Args:
             inst: Instance node to be validated.
             scope: Scope of the validation (syntax, semantics or all)
             ctype: Content type of the instance.
+            vctx: Data shared by the entire validation.
+            prev: Previously validated value of the instance.
 
         Returns:
             ``None`` if validation succeeds.
@@ -259,7 +334,102 @@ class SchemaNode:
             self._mandatory = False
 
     def _post_process(self) -> None:
-        pass
+        """Intern the receiver's names.
+
+        Instance names are used as keys of all cooked objects, so they
+        are shared across instance data, and dictionary lookups and name
+        tests can mostly compare them by identity.
+        """
+        if self.name is None:
+            return
+        self.name = sys.intern(self.name)
+        if self.ns is not None:
+            self.ns = sys.intern(self.ns)
+        self._qname = (self.name, self.ns)
+        self._iname = sys.intern(self.iname())
+
+    def _bind_xpath(self, unresolved: List[Tuple["SchemaNode", "Step"]]
+                    ) -> None:
+        """Bind location steps of receiver's XPath expressions.
+
+        Dependencies of the expressions are recorded, too.
+
+        Args:
+            unresolved: List to which pairs of the receiver and a step
+                that selects no schema node are appended.
+        """
+        if self.when is not None:
+            cn = self if isinstance(self, DataNode) else self.data_parent()
+            self._xpath_deps["when"] = self._bind_expr(
+                self.when, cn, unresolved)
+        if self.must:
+            self._xpath_deps["must"] = [
+                self._bind_expr(m.expression, self, unresolved)
+                for m in self.must]
+
+    def _bind_expr(self, expr: "Expr", cnode: "SchemaNode",
+                   unresolved: List[Tuple["SchemaNode", "Step"]]
+                   ) -> FrozenSet[Optional["SchemaNode"]]:
+        """Bind an XPath expression of the receiver.
+
+        Args:
+            expr: XPath expression.
+            cnode: Schema node of the context node.
+            unresolved: List for unresolved steps.
+
+        Returns:
+            Schema nodes that the expression depends on.
+        """
+        steps = []
+        deps = set()
+        expr._bind([cnode], cnode, steps, deps)
+        unresolved.extend([(self, s) for s in steps])
+        return frozenset(deps)
+
+    def _leafref_target(self) -> Optional["DataNode"]:
+        """Return the data node referred to by receiver's leafref path."""
+        return None
+
+    def _freeze(self) -> None:
+        """Precompute and store properties depending on the schema tree.
+
+        This method has to be called only after the schema is
+        completely built, and must not be called on a descendant before
+        its ancestors.
+        """
+        self._ctype = self.content_type()
+        self._data_parent = self.data_parent()
+        if isinstance(self, DataNode):
+            self._data_path = self.data_path()
+        if self.when is not None:
+            self.when.compile()
+        for m in self.must:
+            m.expression.compile()
+        self._outer_musts = [m for m in self.must
+                             if m.expression._ascent() != 0]
+        self._set_reach()
+        self._frozen = True
+
+    @staticmethod
+    def _max_reach(reaches: List[Optional[int]]) -> Optional[int]:
+        """Return the maximum of `reaches`, or ``None`` if it is unknown."""
+        return None if None in reaches else max(reaches)
+
+    def _set_reach(self) -> None:
+        """Compute the reach of constraints of the receiver itself."""
+        self._reach = self._max_reach(
+            [0] + [m.expression._ascent() for m in self.must])
+
+    def _parent_reach(self) -> Tuple[Optional[int], Optional[int]]:
+        """Return the reach of the receiver's "when" and entire subtree.
+
+        Both values are relative to the instance of the data parent.
+        """
+        wr = self.when._ascent() if self.when else 0
+        if isinstance(self, DataNode):
+            return (None if wr is None else wr - 1,
+                    None if self._reach is None else self._reach - 1)
+        return (wr, self._reach)
 
     def _is_identityref(self) -> bool:
         return False
@@ -311,11 +481,27 @@ class SchemaNode:
 class InternalNode(SchemaNode):
     """Abstract class for schema nodes that have children."""
 
+    __slots__ = ("children", "_mandatory_children", "_child_index",
+                 "_data_child_index", "_iname_index", "_raw_members", "_flat",
+                 "_when_reach", "schema_pattern", "_schema_automaton")
+
     def __init__(self):
         """Initialize the class instance."""
         super().__init__()
         self.children = []  # type: List[SchemaNode]
         self._mandatory_children = set()  # type: MutableSet[SchemaNode]
+        self._child_index = None  # type: Dict[QualName, SchemaNode]
+        """Index of schema children (built in post-processing)."""
+        self._data_child_index = None  # type: Dict[QualName, DataNode]
+        """Index of data children (built in post-processing)."""
+        self._iname_index = None  # type: Dict[InstanceName, DataNode]
+        """Index of data children by instance names."""
+        self._raw_members = {}  # type: Dict[InstanceName, Tuple]
+        """Map of raw member names to converters (built when frozen)."""
+        self._flat = False
+        """Are all data children leafs?"""
+        self._when_reach = None  # type: Optional[int]
+        """Reach of "when" expressions in the schema pattern."""
 
     @property
     def mandatory(self) -> bool:
@@ -331,6 +517,8 @@ class InternalNode(SchemaNode):
             ns: Child's namespace (= `self.ns` if absent).
         """
         ns = ns if ns else self.ns
+        if self._child_index is not None and ns is not None:
+            return self._child_index.get((name, ns))
         todo = []
         for child in self.children:
             if child.name is None:
@@ -362,6 +550,8 @@ class InternalNode(SchemaNode):
         todo = []
         if ns is not None and ns.startswith("@"):
             return self.schema_root().annotations
+        if self._data_child_index is not None and ns is not None:
+            return self._data_child_index.get((name, ns))
         for child in self.children:
             if child.name == name and child.ns == ns:
                 if isinstance(child, DataNode):
@@ -396,30 +586,143 @@ class InternalNode(SchemaNode):
                 res.extend(child.data_children())
         return res
 
-    def from_raw(self, rval: RawObject, jptr: JSONPointer="") -> ObjectValue:
-        """Override the superclass method."""
+    def _cook(self, rval: RawObject,
+              metadata: bool = False) -> ObjectValue:
+        """Override the superclass method.
+
+        Args:
+            rval: Raw object.
+            metadata: Flag indicating that `rval` contains metadata
+                annotations.
+        """
         if not isinstance(rval, dict):
-            raise RawTypeError(jptr, "object")
-        res = ObjectValue()
-        for qn in rval:
-            npath = jptr + "/" + qn
-            if qn.startswith("@"):
-                if qn != "@":
-                    cn = self._iname2qname(qn[1:])
-                    ch = self.get_data_child(*cn)
-                    if ch is None:
-                        raise RawMemberError(npath)
-                res[qn] = self.schema_root().from_raw(rval[qn], npath)
+            raise RawTypeError("", "object")
+        mems = {} if metadata else self._raw_members
+        res = {}
+        for qn, rv in rval.items():
+            ent = mems.get(qn)
+            try:
+                if ent is None:
+                    ent = self._raw_member(qn, metadata)
+                iname, node, cook, leaf = ent
+                val = cook(rv) if cook else node._cook(rv, True)
+                if val is None and leaf:
+                    raise RawTypeError("", node.type.yang_type() + " value")
+            except RawDataError as e:
+                e.path = "/" + qn + e.path
+                raise
+            res[iname] = val
+        return ObjectValue(res)
+
+    def _cook_stream(self, parser: JSONStreamParser) -> ObjectValue:
+        """Override the superclass method.
+
+        Objects whose all members are leafs are small enough to be
+        parsed at once.
+        """
+        if self._flat:
+            return InternalNode._cook(self, parser.small_value())
+        if parser.peek() != "{":
+            raise RawTypeError("", "object")
+        mems = self._raw_members
+        res = {}
+        for qn in parser.members():
+            ent = mems.get(qn)
+            try:
+                if ent is None:
+                    ent = self._raw_member(qn, False)
+                iname, node, cook, leaf = ent
+                if leaf:
+                    val = cook(parser.value())
+                    if val is None:
+                        raise RawTypeError(
+                            "", node.type.yang_type() + " value")
+                elif cook:
+                    val = node._cook_stream(parser)
+                else:
+                    val = node._cook(parser.value(), True)
+            except RawDataError as e:
+                e.path = "/" + qn + e.path
+                raise
+            res[iname] = val
+        return ObjectValue(res)
+
+    def _json_chunks(self, val: ObjectValue, indent: Optional[str],
+                     nl: str) -> Iterator[str]:
+        """Override the superclass method."""
+        if not val:
+            yield "{}"
+            return
+        if indent is None:
+            nl1 = ""
+            sep = ", "
+        else:
+            nl1 = nl + indent
+            sep = "," + nl1
+        buf = ["{" + nl1]
+        first = True
+        for m, mval in val.items():
+            if first:
+                first = False
             else:
-                cn = self._iname2qname(qn)
-                ch = self.get_data_child(*cn)
+                buf.append(sep)
+            buf.append(encode_basestring_ascii(m) + ": ")
+            if m.startswith("@"):
+                ch = self.schema_root()
+            else:
+                ch = self._member_child(m)
                 if ch is None:
-                    raise RawMemberError(npath)
-                if "@" in jptr and not isinstance(ch, AnnotationNode):
-                    raise RawMemberError(npath)
-                iname = ch.iname()
-                res[iname] = ch.from_raw(rval[qn], npath)
-        return res
+                    raise NonexistentSchemaNode(
+                        self.qual_name, *self._iname2qname(m))
+                if isinstance(ch, LeafNode):
+                    buf.append(ch._json_scalar(
+                        ch.type.to_raw(mval), indent, nl1))
+                    continue
+            yield "".join(buf)
+            buf = []
+            yield from ch._json_chunks(mval, indent, nl1)
+        buf.append(nl + "}" if indent is not None else "}")
+        yield "".join(buf)
+
+    def _raw_member(self, qn: InstanceName, metadata: bool) -> Tuple:
+        """Return an entry for a member that isn't in the raw members map.
+
+        The entry has the same form as in :attr:`_raw_members`. For
+        metadata annotations, the converter is ``None``, and the schema
+        root has to be used for converting the value.
+
+        Raises:
+            RawMemberError: If the member is not permitted.
+        """
+        if qn.startswith("@"):
+            if qn != "@":
+                cn = self._iname2qname(qn[1:])
+                if self.get_data_child(*cn) is None:
+                    raise RawMemberError("")
+            return (qn, self.schema_root(), None, False)
+        ch = self._member_child(qn)
+        if ch is None or metadata and not isinstance(ch, AnnotationNode):
+            raise RawMemberError("")
+        return (ch.iname(), ch, ch._cook, False)
+
+    def _make_raw_members(self) -> None:
+        """Build the map of raw member names to child converters.
+
+        Both the instance name and fully qualified name of every data
+        child are included. Each entry contains the instance name, the
+        child, its converter and a flag that is ``True`` if the
+        converter is the scalar parser of a leaf type, which returns
+        ``None`` for invalid values.
+        """
+        self._raw_members = {}
+        self._flat = self._iname_index is not None
+        for c in (self._iname_index.values()
+                  if self._iname_index is not None else ()):
+            leaf = isinstance(c, LeafNode)
+            self._flat = self._flat and leaf
+            ent = (c.iname(), c, c.type.from_raw if leaf else c._cook, leaf)
+            self._raw_members[ent[0]] = ent
+            self._raw_members.setdefault(c.ns + ":" + c.name, ent)
 
     def _node_digest(self) -> Dict[str, Any]:
         res = super()._node_digest()
@@ -433,12 +736,29 @@ class InternalNode(SchemaNode):
         return res
 
     def _validate(self, inst: "InstanceNode", scope: ValidationScope,
-                  ctype: ContentType) -> None:
+                  ctype: ContentType, vctx: "ValidationContext",
+                  prev: Value = None) -> None:
         """Extend the superclass method."""
-        if scope.value & ValidationScope.syntax.value:   # schema
-            self._check_schema_pattern(inst, ctype)
-        for m in inst.value:              # all members
-            inst._member(m).validate(scope, ctype)
+        val = inst.value
+        if (scope.value & ValidationScope.syntax.value and   # schema
+                not (val is prev and self._when_reach == 0)):
+            try:
+                self._check_schema_pattern(inst, ctype)
+            except ValidationError as e:
+                vctx.report(e)
+        if not isinstance(prev, ObjectValue):
+            prev = {}
+        for m in val:                     # all members
+            try:
+                mi = inst._member(m)
+            except NonexistentSchemaNode:
+                if vctx.errors is None:
+                    raise
+                if not scope.value & ValidationScope.syntax.value:
+                    vctx.report(SchemaError(
+                        inst.json_pointer(), "member-not-allowed", m))
+                continue                  # reported by schema check
+            mi.schema_node._validate(mi, scope, ctype, vctx, prev.get(m))
 
     def _add_child(self, node: SchemaNode) -> None:
         node.parent = self
@@ -450,21 +770,23 @@ class InternalNode(SchemaNode):
 
     def _check_schema_pattern(self, inst: "InstanceNode",
                               ctype: ContentType) -> None:
-        p = self.schema_pattern
-        p._eval_when(inst)
+        aut = self._schema_automaton
+        tab = aut.table(inst, ctype)
+        p = aut.start
         for m in inst.value:
             if m.startswith("@"):
                 continue
-            p = p.deriv(m, ctype)
+            p = tab.deriv(p, m)
             if isinstance(p, NotAllowed):
                 raise SchemaError(inst.json_pointer(), "member-not-allowed", m + (
                     "" if ctype == ContentType.all else " (" + ctype.name + ")"))
-        if not p.nullable(ctype):
+        if not tab.nullable(p):
             raise SchemaError(inst.json_pointer(), "missing-data", str(p))
 
     def _make_schema_patterns(self) -> None:
         """Build schema pattern for the receiver and its data descendants."""
         self.schema_pattern = self._schema_pattern()
+        self._schema_automaton = PatternAutomaton(self.schema_pattern)
         for dc in self.data_children():
             if isinstance(dc, InternalNode):
                 dc._make_schema_patterns()
@@ -483,6 +805,80 @@ class InternalNode(SchemaNode):
         super()._post_process()
         for c in self.children:
             c._post_process()
+        self._make_indices()
+
+    def _bind_xpath(self, unresolved: List[Tuple[SchemaNode, "Step"]]
+                    ) -> None:
+        super()._bind_xpath(unresolved)
+        for c in self.children:
+            c._bind_xpath(unresolved)
+
+    def _freeze(self) -> None:
+        super()._freeze()
+        for c in self.children:
+            c._freeze()
+        self._add_children_reach()
+        self._make_raw_members()
+
+    def _add_children_reach(self) -> None:
+        """Add the reach of constraints in children's subtrees.
+
+        Reach of "when" expressions that are checked in the receiver's
+        schema pattern is also recorded separately.
+        """
+        wreach = [0]
+        reach = [self._reach]
+        for c in self.children:
+            if isinstance(c, SchemaTreeNode):
+                continue
+            wr, sr = c._parent_reach()
+            wreach.append(wr)
+            reach.append(sr)
+            if not isinstance(c, DataNode):
+                wreach.append(c._when_reach)
+        self._when_reach = self._max_reach(wreach)
+        reach.append(self._when_reach)
+        self._reach = self._max_reach(reach)
+
+    def _make_indices(self) -> None:
+        """Build indices of the receiver's children.
+
+        The indices reproduce the results of the linear search in
+        :meth:`get_child` and :meth:`get_data_child`, i.e. children of
+        nameless nodes (for :meth:`get_child`) and of all non-data
+        nodes (for :meth:`get_data_child`) are included, too. Lookups
+        without namespace (possible only in the schema root) still
+        use the linear search.
+        """
+        cind = {}
+        dind = {}
+        nameless = None
+        for c in self.children:
+            if c.name is None:
+                if nameless is None:
+                    nameless = c
+            else:
+                cind.setdefault(c.qual_name, c)
+            if isinstance(c, DataNode):
+                dind.setdefault(c.qual_name, c)
+        if nameless is not None:
+            for qn, c in nameless._child_index.items():
+                cind.setdefault(qn, c)
+        for c in self.children:
+            if not isinstance(c, DataNode):
+                for qn, dc in c._data_child_index.items():
+                    dind.setdefault(qn, dc)
+        self._child_index = cind
+        self._data_child_index = dind
+        self._iname_index = {c.iname(): c for c in dind.values()}
+
+    def _member_child(self, iname: InstanceName) -> Optional["DataNode"]:
+        """Return data child corresponding to an instance name."""
+        if self._iname_index is not None:
+            res = self._iname_index.get(iname)
+            if res is not None:
+                return res
+        return self.get_data_child(*self._iname2qname(iname))
 
     def _add_mandatory_child(self, node: SchemaNode) -> None:
         """Add `node` to the set of mandatory children."""
@@ -628,6 +1024,8 @@ class InternalNode(SchemaNode):
 class GroupNode(InternalNode):
     """Anonymous group of schema nodes."""
 
+    __slots__ = ()
+
     def _handle_child(self, node: SchemaNode, stmt: Statement,
                       sctx: SchemaContext) -> None:
         if not isinstance(self.parent, ChoiceNode) or isinstance(node, CaseNode):
@@ -652,6 +1050,8 @@ class GroupNode(InternalNode):
 class SchemaTreeNode(GroupNode):
     """Root node of a schema tree."""
 
+    __slots__ = ()
+
     def __init__(self):
         """Initialize the class instance."""
         super().__init__()
@@ -671,6 +1071,8 @@ class SchemaTreeNode(GroupNode):
 class DataNode(SchemaNode):
     """Abstract superclass for all data nodes."""
 
+    __slots__ = ()
+
     def __init__(self):
         """Initialize the class instance."""
         super().__init__()
@@ -683,7 +1085,7 @@ class DataNode(SchemaNode):
             rval: Raw value to be used for the returned instance.
         """
         val = self.from_raw(rval)
-        return ObjectMember(self.iname(), {}, val, None, self, datetime.now())
+        return ObjectMember(self.iname(), {}, val, None, self, new_timestamp())
 
     def split_instance_route(self, route: "InstanceRoute") -> Optional[Tuple[
             "InstanceRoute", "InstanceRoute"]]:
@@ -722,11 +1124,15 @@ class DataNode(SchemaNode):
                 return None
 
     def _validate(self, inst: "InstanceNode", scope: ValidationScope,
-                  ctype: ContentType) -> None:
+                  ctype: ContentType, vctx: "ValidationContext",
+                  prev: Value = None) -> None:
         """Extend the superclass method."""
+        unchanged = inst.value is prev
+        if unchanged and self._reach == 0:
+            return
         if scope.value & ValidationScope.semantics.value:
-            self._check_must(inst)        # must expressions
-        super()._validate(inst, scope, ctype)
+            self._check_must(inst, vctx, unchanged)  # must expressions
+        super()._validate(inst, scope, ctype, vctx, prev)
 
     def _default_instance(self, pnode: "InstanceNode", ctype: ContentType,
                           lazy: bool=False) -> "InstanceNode":
@@ -740,11 +1146,12 @@ class DataNode(SchemaNode):
                 return wd.up()
         return pnode
 
-    def _check_must(self, inst: "InstanceNode") -> None:
-        for m in self.must:
+    def _check_must(self, inst: "InstanceNode", vctx: "ValidationContext",
+                    unchanged: bool = False) -> None:
+        for m in (self._outer_musts if unchanged else self.must):
             if not m.expression.evaluate(inst):
-                raise SemanticError(inst.json_pointer(), m.error_tag,
-                                    m.error_message)
+                vctx.report(SemanticError(inst.json_pointer(), m.error_tag,
+                                          m.error_message))
 
     def _pattern_entry(self) -> SchemaPattern:
         m = Member(self.iname(), self.content_type(), self.when)
@@ -765,6 +1172,8 @@ class DataNode(SchemaNode):
 class TerminalNode(SchemaNode):
     """Abstract superclass for terminal nodes in the schema tree."""
 
+    __slots__ = ("type", "_default")
+
     def __init__(self):
         """Initialize the class instance."""
         super().__init__()
@@ -778,13 +1187,35 @@ class TerminalNode(SchemaNode):
         return (ContentType.config if self.parent.config else
                 ContentType.nonconfig)
 
-    def from_raw(self, rval: RawScalar, jptr: JSONPointer="") -> ScalarValue:
+    def _cook(self, rval: RawScalar) -> ScalarValue:
         """Override the superclass method."""
         res = self.type.from_raw(rval)
         if res is None:
-            raise RawTypeError(jptr, self.type.yang_type() + " value")
+            raise RawTypeError("", self.type.yang_type() + " value")
         return res
 
+    def _cook_stream(self, parser: JSONStreamParser) -> ScalarValue:
+        """Override the superclass method."""
+        return TerminalNode._cook(self, parser.value())
+
+    def _json_chunks(self, val: ScalarValue, indent: Optional[str],
+                     nl: str) -> Iterator[str]:
+        """Override the superclass method."""
+        yield self._json_scalar(self.type.to_raw(val), indent, nl)
+
+    @staticmethod
+    def _json_scalar(raw: RawScalar, indent: Optional[str], nl: str) -> str:
+        """Return JSON text representing a raw scalar value."""
+        if isinstance(raw, str):
+            return encode_basestring_ascii(raw)
+        if raw is True:
+            return "true"
+        if raw is False:
+            return "false"
+        if isinstance(raw, int):
+            return int.__repr__(raw)
+        return json.dumps(raw, indent=indent).replace("\n", nl)
+
     def _node_digest(self) -> Dict[str, Any]:
         res = super()._node_digest()
         res["type"] = self.type._type_digest(self.config)
@@ -794,21 +1225,26 @@ class TerminalNode(SchemaNode):
         return res
 
     def _validate(self, inst: "InstanceNode", scope: ValidationScope,
-                  ctype: ContentType) -> None:
+                  ctype: ContentType, vctx: "ValidationContext",
+                  prev: Value = None) -> None:
         """Extend the superclass method."""
         if (scope.value & ValidationScope.syntax.value and
-                inst.value not in self.type):
-            raise SchemaError(inst.json_pointer(), self.type.error_tag,
-                              self.type.error_message)
+                inst.value is not prev and inst.value not in self.type):
+            vctx.report(SchemaError(inst.json_pointer(), self.type.error_tag,
+                                    self.type.error_message))
         if (isinstance(self.type, LinkType) and        # referential integrity
                 scope.value & ValidationScope.semantics.value and
                 self.type.require_instance):
             try:
-                tgt = inst._deref()
+                tgts = (vctx.leafref_targets(self.type, inst)
+                        if isinstance(self.type, LeafrefType) else None)
+                found = (bool(inst._deref()) if tgts is None
+                         else str(inst) in tgts)
             except YangsonException:
-                tgt = []
-            if not tgt:
-                raise SemanticError(inst.json_pointer(), "instance-required")
+                found = False
+            if not found:
+                vctx.report(
+                    SemanticError(inst.json_pointer(), "instance-required"))
 
     def _default_value(self, inst: "InstanceNode", ctype: ContentType,
                        lazy: bool) -> "InstanceNode":
@@ -823,6 +1259,30 @@ class TerminalNode(SchemaNode):
                 raise InvalidLeafrefPath(self.qual_name)
             self.type.ref_type = ref.type
 
+    def _bind_xpath(self, unresolved: List[Tuple[SchemaNode, "Step"]]
+                    ) -> None:
+        super()._bind_xpath(unresolved)
+        if isinstance(self.type, LeafrefType):
+            self._xpath_deps["path"] = self._bind_expr(
+                self.type.path, self, unresolved)
+
+    def _leafref_target(self) -> Optional["DataNode"]:
+        if isinstance(self.type, LeafrefType):
+            return self._follow_leafref(self.type.path, self)
+
+    def _freeze(self) -> None:
+        super()._freeze()
+        if isinstance(self.type, LeafrefType):
+            self.type.path.compile()
+
+    def _set_reach(self) -> None:
+        """Extend the superclass method."""
+        super()._set_reach()
+        if isinstance(self.type, LinkType) and self.type.require_instance:
+            self._reach = self._max_reach([
+                self._reach, self.type.path._ascent()
+                if isinstance(self.type, LeafrefType) else None])
+
     def _is_identityref(self) -> bool:
         return isinstance(self.type, IdentityrefType)
 
@@ -840,6 +1300,8 @@ class TerminalNode(SchemaNode):
 class ContainerNode(DataNode, InternalNode):
     """Container node."""
 
+    __slots__ = ("presence",)
+
     def __init__(self):
         """Initialize the class instance."""
         super().__init__()
@@ -890,6 +1352,10 @@ class ContainerNode(DataNode, InternalNode):
 class SequenceNode(DataNode):
     """Abstract class for data nodes that represent a sequence."""
 
+    # Slots for the attributes initialized below are defined in
+    # subclasses, each of which also inherits from a class with slots.
+    __slots__ = ()
+
     def __init__(self):
         """Initialize the class instance."""
         super().__init__()
@@ -903,16 +1369,68 @@ class SequenceNode(DataNode):
         return self.min_elements > 0
 
     def _validate(self, inst: "InstanceNode", scope: ValidationScope,
-                  ctype: ContentType) -> None:
+                  ctype: ContentType, vctx: "ValidationContext",
+                  prev: Value = None) -> None:
         """Extend the superclass method."""
         if isinstance(inst, ArrayEntry):
-            super()._validate(inst, scope, ctype)
-        else:
-            if scope.value & ValidationScope.semantics.value:
-                self._check_list_props(inst)
+            super()._validate(inst, scope, ctype, vctx, prev)
+            return
+        val = inst.value
+        if val is prev and self._reach == 0:
+            return
+        pents = self._previous_entries(prev)
+        if val is not prev:
+            self._check_array(inst, scope, vctx, pents)
+        self._validate_entries(inst, scope, ctype, vctx, pents, 0, len(val))
+
+    @staticmethod
+    def _previous_entries(prev: Optional[Value]) -> Dict[int, Value]:
+        """Return previously validated entries indexed by their ids."""
+        return ({id(v): v for v in prev}
+                if isinstance(prev, ArrayValue) else {})
+
+    def _check_array(self, inst: "InstanceNode", scope: ValidationScope,
+                     vctx: "ValidationContext",
+                     pents: Dict[int, Value]) -> None:
+        """Check constraints of the entire list or leaf-list.
+
+        Args:
+            inst: Instance node of the array.
+            scope: Scope of the validation.
+            vctx: Data shared by the entire validation.
+            pents: Previously validated entries indexed by their ids.
+        """
+        if scope.value & ValidationScope.semantics.value:
+            val = inst.value
+            ids = set([id(v) for v in val])
+            try:
+                if len(ids) < len(val) or not ids <= pents.keys():
+                    self._check_list_props(inst)
+            except ValidationError as e:
+                vctx.report(e)
+            try:
                 self._check_cardinality(inst)
-            for e in inst:
-                super()._validate(e, scope, ctype)
+            except SemanticError as e:
+                vctx.report(e)
+
+    def _validate_entries(self, inst: "InstanceNode", scope: ValidationScope,
+                          ctype: ContentType, vctx: "ValidationContext",
+                          pents: Dict[int, Value], start: int,
+                          stop: int) -> None:
+        """Validate entries of an array with indices in a given range.
+
+        Args:
+            inst: Instance node of the array.
+            scope: Scope of the validation.
+            ctype: Content type of the instance.
+            vctx: Data shared by the entire validation.
+            pents: Previously validated entries indexed by their ids.
+            start: Index of the first entry.
+            stop: Index following the last entry.
+        """
+        for i in range(start, stop):
+            e = inst._entry(i)
+            super()._validate(e, scope, ctype, vctx, pents.get(id(e.value)))
 
     def _check_cardinality(self, inst: "InstanceNode") -> None:
         if len(inst.value) < self.min_elements:
@@ -943,16 +1461,63 @@ class SequenceNode(DataNode):
         """Extend the superclass method."""
         return super()._tree_line() + "*"
 
-    def from_raw(self, rval: RawList, jptr: JSONPointer="") -> ArrayValue:
+    def _cook(self, rval: RawList) -> ArrayValue:
         """Override the superclass method."""
         if not isinstance(rval, list):
-            raise RawTypeError(jptr, "array")
-        res = ArrayValue()
-        i = 0
-        for en in rval:
-            i += 1
-            res.append(self.entry_from_raw(en, "{}/{}".format(jptr, i)))
-        return res
+            raise RawTypeError("", "array")
+        cook = super()._cook
+        res = []
+        add = res.append
+        try:
+            for en in rval:
+                add(cook(en))
+        except RawDataError as e:
+            e.path = "/{}{}".format(len(res) + 1, e.path)
+            raise
+        return ArrayValue(res)
+
+    def _cook_stream(self, parser: JSONStreamParser) -> ArrayValue:
+        """Override the superclass method."""
+        if parser.peek() != "[":
+            raise RawTypeError("", "array")
+        cook = super()._cook_stream
+        res = []
+        add = res.append
+        try:
+            for i in parser.entries():
+                add(cook(parser))
+        except RawDataError as e:
+            e.path = "/{}{}".format(len(res) + 1, e.path)
+            raise
+        return ArrayValue(res)
+
+    def _json_chunks(self, val: ArrayValue, indent: Optional[str],
+                     nl: str) -> Iterator[str]:
+        """Override the superclass method."""
+        if not val:
+            yield "[]"
+            return
+        if indent is None:
+            nl1 = ""
+            sep = ", "
+        else:
+            nl1 = nl + indent
+            sep = "," + nl1
+        entry = super()._json_chunks
+        yield "[" + nl1
+        first = True
+        for en in val:
+            if first:
+                first = False
+            else:
+                yield sep
+            yield from entry(en, indent, nl1)
+        yield nl + "]" if indent is not None else "]"
+
+    def _entry_json_chunks(self, val: EntryValue, indent: Optional[str],
+                           nl: str) -> Iterator[str]:
+        """Generate JSON text representing a cooked entry value."""
+        return super()._json_chunks(val, indent, nl)
 
     def entry_from_raw(self, rval: RawEntry, jptr: JSONPointer="") -> EntryValue:
         """Transform a raw (leaf-)list entry into the cooked form.
@@ -966,12 +1531,19 @@ class SequenceNode(DataNode):
                 in the schema.
             YangTypeError: If a scalar value inside `rval` is of incorrect type.
         """
-        return super().from_raw(rval, jptr)
+        try:
+            return super()._cook(rval)
+        except RawDataError as e:
+            e.path = jptr + e.path
+            raise
 
 
 class ListNode(SequenceNode, InternalNode):
     """List node."""
 
+    __slots__ = ("min_elements", "max_elements", "user_ordered", "keys",
+                 "_key_members", "unique")
+
     def __init__(self):
         """Initialize the class instance."""
         super().__init__()
@@ -1009,8 +1581,10 @@ class ListNode(SequenceNode, InternalNode):
                       inst: "InstanceNode") -> None:
         uvals = set()
         for en in inst:
-            den = en.add_defaults()
-            uval = tuple([den._peek_schema_route(sr) for sr in unique])
+            uval = tuple([en._peek_schema_route(sr) for sr in unique])
+            if None in uval:
+                den = en.add_defaults()
+                uval = tuple([den._peek_schema_route(sr) for sr in unique])
             if None not in uval:
                 if uval in uvals:
                     raise SemanticError(inst.json_pointer(), "data-not-unique")
@@ -1061,6 +1635,8 @@ class ListNode(SequenceNode, InternalNode):
 class ChoiceNode(InternalNode):
     """Choice node."""
 
+    __slots__ = ("default_case", "_mandatory")
+
     def __init__(self):
         """Initialize the class instance."""
         super().__init__()
@@ -1102,7 +1678,8 @@ class ChoiceNode(InternalNode):
         prev = self.children[0]._schema_pattern()
         for c in self.children[1:]:
             prev = ChoicePattern(c._schema_pattern(), prev, self.name)
-        prev.ctype = self.content_type()
+        if isinstance(prev, Typeable):
+            prev.ctype = self.content_type()
         if not self.mandatory:
             prev = SchemaPattern.optional(prev)
         return ConditionalPattern(prev, self.when) if self.when else prev
@@ -1149,6 +1726,8 @@ class ChoiceNode(InternalNode):
 class CaseNode(InternalNode):
     """Case node."""
 
+    __slots__ = ()
+
     def _pattern_entry(self) -> SchemaPattern:
         return super()._schema_pattern()
 
@@ -1161,6 +1740,8 @@ class CaseNode(InternalNode):
 class LeafNode(DataNode, TerminalNode):
     """Leaf node."""
 
+    __slots__ = ("_mandatory",)
+
     def __init__(self):
         """Initialize the class instance."""
         super().__init__()
@@ -1198,6 +1779,8 @@ class LeafNode(DataNode, TerminalNode):
 class LeafListNode(SequenceNode, TerminalNode):
     """Leaf-list node."""
 
+    __slots__ = ("min_elements", "max_elements", "user_ordered")
+
     @property
     def default(self) -> Optional[ScalarValue]:
         """Default value of the receiver, if any."""
@@ -1236,6 +1819,8 @@ class LeafListNode(SequenceNode, TerminalNode):
 class AnyContentNode(DataNode):
     """Abstract class for anydata or anyxml nodes."""
 
+    __slots__ = ("_mandatory",)
+
     def __init__(self):
         """Initialize the class instance."""
         super().__init__()
@@ -1250,7 +1835,12 @@ class AnyContentNode(DataNode):
         """Is the receiver a mandatory node?"""
         return self._mandatory
 
-    def from_raw(self, rval: RawValue, jptr: JSONPointer="") -> Value:
+    def _json_chunks(self, val: Value, indent: Optional[str],
+                     nl: str) -> Iterator[str]:
+        """Override the superclass method."""
+        yield json.dumps(val, indent=indent).replace("\n", nl)
+
+    def _cook(self, rval: RawValue) -> Value:
         """Override the superclass method."""
         def convert(val):
             if isinstance(val, list):
@@ -1273,23 +1863,28 @@ class AnyContentNode(DataNode):
         return ""
 
     def _post_process(self) -> None:
+        super()._post_process()
         if self._mandatory:
             self.parent._add_mandatory_child(self)
 
 
 class AnydataNode(AnyContentNode):
     """Anydata node."""
-    pass
+
+    __slots__ = ()
 
 
 class AnyxmlNode(AnyContentNode):
     """Anyxml node."""
-    pass
+
+    __slots__ = ()
 
 
 class RpcActionNode(SchemaTreeNode):
     """RPC or action node."""
 
+    __slots__ = ()
+
     def __init__(self):
         """Initialize the class instance."""
         super().__init__()
@@ -1318,6 +1913,8 @@ class RpcActionNode(SchemaTreeNode):
 class InputNode(SchemaTreeNode):
     """RPC or action input node."""
 
+    __slots__ = ("_config",)
+
     def __init__(self, ns):
         """Initialize the class instance."""
         super().__init__()
@@ -1335,6 +1932,8 @@ class InputNode(SchemaTreeNode):
 class OutputNode(SchemaTreeNode):
     """RPC or action output node."""
 
+    __slots__ = ("_config",)
+
     def __init__(self, ns):
         """Initialize the class instance."""
         super().__init__()
@@ -1352,6 +1951,8 @@ class OutputNode(SchemaTreeNode):
 class NotificationNode(SchemaTreeNode):
     """Notification node."""
 
+    __slots__ = ()
+
     def __init__(self):
         """Initialize the class instance."""
         super().__init__()
@@ -1367,6 +1968,8 @@ class NotificationNode(SchemaTreeNode):
 class AnnotationNode(DataNode, TerminalNode):
     """Annotation node."""
 
+    __slots__ = ()
+
     def __init__(self):
         """Initialize the class instance."""
         super().__init__()
@@ -1385,6 +1988,74 @@ class AnnotationNode(DataNode, TerminalNode):
         return super()._tree_line_prefix() + " @"
 
 
+class ValidationContext:
+    """Data shared by all schema nodes during a single validation."""
+
+    def __init__(self, collect: bool = False, max_errors: int = None):
+        """Initialize the class instance.
+
+        Args:
+            collect: Flag requesting that validation errors be collected
+                instead of raised.
+            max_errors: Maximum number of collected errors.
+        """
+        self.errors = None  # type: Optional[List[ValidationError]]
+        """Collected validation errors, or ``None`` if they are raised."""
+        self.max_errors = max_errors
+        """Maximum number of collected errors (``None`` means no limit)."""
+        if collect:
+            self.errors = []
+        self._targets = {}  # type: Dict[Tuple, Tuple[Value, FrozenSet[str]]]
+        """Index of leafref targets."""
+
+    def report(self, err: ValidationError) -> None:
+        """Record a validation error, or raise it.
+
+        Args:
+            err: Validation error.
+
+        Raises:
+            ValidationError: If errors are not collected, or if the
+                maximum number of errors has been reached.
+        """
+        if self.errors is None:
+            raise err
+        self.errors.append(err)
+        if (self.max_errors is not None and
+                len(self.errors) >= self.max_errors):
+            raise err
+
+    def leafref_targets(self, ltype: LeafrefType,
+                        node: "InstanceNode") -> Optional[FrozenSet[str]]:
+        """Return canonical strings of all targets of a leafref instance.
+
+        The targets are computed only once for every leafref type and
+        value of the node selected by the anchor of its path.
+
+        Args:
+            ltype: Type of the referring node.
+            node: Referring instance node.
+
+        Returns:
+            Set of target strings, or ``None`` if the path of `ltype`
+            has no anchor.
+        """
+        anchor = ltype._anchor
+        if anchor is None:
+            return None
+        ans = anchor.evaluate(node)
+        if not ans:
+            return frozenset()
+        aval = ans[0].value
+        key = (ltype, node.namespace, id(aval))
+        ent = self._targets.get(key)
+        if ent is None or ent[0] is not aval:
+            tgts = ltype.path.evaluate(node)
+            ent = (aval, frozenset([str(n) for n in tgts]))
+            self._targets[key] = ent
+        return ent[1]
+
+
 from .xpathast import Expr, LocationPath, Step, Root        # NOQA
 from .instance import (ArrayEntry, EmptyList, InstanceNode,  # NOQA
                        InstanceRoute, MemberName, ObjectMember)
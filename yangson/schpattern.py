@@ -17,6 +17,8 @@
 
 """This module defines classes for schema patterns."""
 
+from collections import Counter
+from typing import Hashable, List
 from .enumerations import ContentType
 from .typealiases import InstanceName, YangIdentifier
 from .typealiases import _Singleton
@@ -26,6 +28,8 @@ from .xpathast import Expr
 class SchemaPattern:
     """Abstract class for schema patterns."""
 
+    __slots__ = ()
+
     @staticmethod
     def optional(p: "SchemaPattern") -> "SchemaPattern":
         """Make `p` an optional pattern."""
@@ -42,10 +46,33 @@ class SchemaPattern:
     def _eval_when(self, cnode: "InstanceNode") -> None:
         return
 
+    def _guards(self) -> List["Conditional"]:
+        """Return the list of conditional subpatterns with "when"."""
+        return []
+
+    def _key(self) -> Hashable:
+        """Return a key identifying structurally equivalent patterns."""
+        return self
+
+    def _operand_keys(self) -> List[Hashable]:
+        """Return keys of operands of nested patterns of receiver's class."""
+        res = []
+        todo = [self]
+        while todo:
+            p = todo.pop()
+            if type(p) is type(self):
+                todo.append(p.right)
+                todo.append(p.left)
+            else:
+                res.append(p._key())
+        return res
+
 
 class Empty(SchemaPattern, metaclass=_Singleton):
     """Singleton class representing the empty pattern."""
 
+    __slots__ = ()
+
     def nullable(self, ctype: ContentType) -> bool:
         """Override the superclass method."""
         return True
@@ -67,10 +94,15 @@ class Empty(SchemaPattern, metaclass=_Singleton):
 
 class NotAllowed(SchemaPattern):
 
+    __slots__ = ()
+
     def deriv(self, x: str, ctype: ContentType) -> SchemaPattern:
         """Return derivative of the receiver."""
         return self
 
+    def _key(self) -> Hashable:
+        return NotAllowed
+
     def tree(self, indent: int = 0):
         return " " * indent + "NotAllowed"
 
@@ -81,6 +113,8 @@ class NotAllowed(SchemaPattern):
 class Conditional(SchemaPattern):
     """Class representing conditional pattern."""
 
+    __slots__ = ("when", "_val_when")
+
     def __init__(self, when: Expr):
         """Initialize the class instance."""
         self.when = when
@@ -93,6 +127,9 @@ class Conditional(SchemaPattern):
     def _eval_when(self, cnode: "InstanceNode") -> None:
         self._val_when = bool(self.when.evaluate(cnode))
 
+    def _guards(self) -> List["Conditional"]:
+        return [self] if self.when else []
+
     def check_when(self) -> bool:
         return not self.when or self._val_when
 
@@ -100,6 +137,10 @@ class Conditional(SchemaPattern):
 class Typeable(SchemaPattern):
     """Multiple content types and their combinations."""
 
+    # The ``ctype`` slot is defined in subclasses because of multiple
+    # inheritance.
+    __slots__ = ()
+
     def __init__(self, ctype: ContentType):
         """Initialize the class instance."""
         self.ctype = ctype
@@ -111,6 +152,8 @@ class Typeable(SchemaPattern):
 class ConditionalPattern(Conditional):
     """Class representing conditional pattern."""
 
+    __slots__ = ("pattern",)
+
     def __init__(self, p: SchemaPattern, when: Expr):
         """Initialize the class instance."""
         super().__init__(when)
@@ -120,6 +163,9 @@ class ConditionalPattern(Conditional):
         super()._eval_when(cnode)
         self.pattern._eval_when(cnode)
 
+    def _guards(self) -> List[Conditional]:
+        return super()._guards() + self.pattern._guards()
+
     def nullable(self, ctype: ContentType) -> bool:
         """Override the superclass method."""
         return (not self.check_when() or self.pattern.nullable(ctype))
@@ -139,6 +185,8 @@ class ConditionalPattern(Conditional):
 
 class Member(Typeable, Conditional):
 
+    __slots__ = ("ctype", "name")
+
     def __init__(self, name: InstanceName, ctype: ContentType,
                  when: Expr):
         Typeable.__init__(self, ctype)
@@ -169,6 +217,8 @@ class Member(Typeable, Conditional):
 
 class Alternative(SchemaPattern):
 
+    __slots__ = ("left", "right")
+
     @classmethod
     def combine(cls, p: SchemaPattern, q: SchemaPattern) -> "Alternative":
         if isinstance(p, NotAllowed):
@@ -186,6 +236,14 @@ class Alternative(SchemaPattern):
         self.left._eval_when(cnode)
         self.right._eval_when(cnode)
 
+    def _guards(self) -> List[Conditional]:
+        return self.left._guards() + self.right._guards()
+
+    def _key(self) -> Hashable:
+        if type(self) is not Alternative:
+            return self
+        return (Alternative, frozenset(self._operand_keys()))
+
     def nullable(self, ctype: ContentType) -> bool:
         """Override the superclass method."""
         return self.left.nullable(ctype) or self.right.nullable(ctype)
@@ -206,6 +264,8 @@ class Alternative(SchemaPattern):
 
 class ChoicePattern(Alternative, Typeable):
 
+    __slots__ = ("ctype", "name")
+
     def __init__(self, p: SchemaPattern, q: SchemaPattern,
                  name: YangIdentifier):
         super().__init__(p, q)
@@ -227,6 +287,8 @@ class ChoicePattern(Alternative, Typeable):
 
 class Pair(SchemaPattern):
 
+    __slots__ = ("left", "right")
+
     @classmethod
     def combine(cls, p: SchemaPattern, q: SchemaPattern):
         if p.empty():
@@ -258,6 +320,12 @@ class Pair(SchemaPattern):
         self.left._eval_when(cnode)
         self.right._eval_when(cnode)
 
+    def _guards(self) -> List[Conditional]:
+        return self.left._guards() + self.right._guards()
+
+    def _key(self) -> Hashable:
+        return (Pair, frozenset(Counter(self._operand_keys()).items()))
+
     def tree(self, indent: int = 0):
         return (" " * indent + "Pair\n" +
                 self.left.tree(indent + 2) + "\n" +
@@ -265,3 +333,94 @@ class Pair(SchemaPattern):
 
     def __str__(self) -> str:
         return str(self.left)
+
+
+class PatternAutomaton:
+    """Deterministic automaton compiled from a schema pattern.
+
+    The automaton is built lazily: its states are structurally distinct
+    derivatives of the start pattern, and transitions are memoized as
+    they are needed. Values of all "when" conditions in the pattern
+    (guards) are evaluated once for every instance, and the automaton
+    keeps a separate transition table for every combination of guard
+    values and content type.
+    """
+
+    __slots__ = ("start", "guards", "_tables")
+
+    max_states = 1000
+    """Maximum number of states memoized in a transition table."""
+
+    def __init__(self, pattern: SchemaPattern):
+        """Initialize the class instance."""
+        self.start = pattern
+        """Start state."""
+        self.guards = pattern._guards()  # type: List[Conditional]
+        """Conditional subpatterns of the start pattern."""
+        self._tables = {}
+        """Transition tables indexed by content type and guard values."""
+
+    def table(self, cnode: "InstanceNode",
+              ctype: ContentType) -> "TransitionTable":
+        """Return transition table for an instance and content type.
+
+        Args:
+            cnode: Instance node whose members are to be matched.
+            ctype: Content type of the instance.
+        """
+        if self.guards:
+            self.start._eval_when(cnode)
+            key = (ctype, tuple([g.check_when() for g in self.guards]))
+        else:
+            key = ctype
+        try:
+            return self._tables[key]
+        except KeyError:
+            res = self._tables[key] = TransitionTable(self, ctype)
+            return res
+
+
+class TransitionTable:
+    """Memoized transitions for a content type and values of guards."""
+
+    __slots__ = ("automaton", "ctype", "_states", "_trans", "_nullable")
+
+    def __init__(self, automaton: PatternAutomaton, ctype: ContentType):
+        """Initialize the class instance."""
+        self.automaton = automaton
+        self.ctype = ctype
+        self._states = {}
+        """Map of pattern keys to canonical states."""
+        self._trans = {}
+        """Map of states to rows of transitions indexed by member names."""
+        self._nullable = {}
+        """Map of states to flags telling whether they are accepting."""
+
+    def deriv(self, state: SchemaPattern, x: InstanceName) -> SchemaPattern:
+        """Return the state following `state` after member `x`.
+
+        The transition is computed only if it is not memoized, and
+        then the guard values of the table must be in effect.
+        """
+        row = self._trans.get(state)
+        if row is not None:
+            res = row.get(x)
+            if res is not None:
+                return res
+        else:
+            if len(self._trans) >= self.automaton.max_states:
+                self._trans.clear()
+                self._states.clear()
+                self._nullable.clear()
+            row = self._trans[state] = {}
+        res = state.deriv(x, self.ctype)
+        res = row[x] = self._states.setdefault(res._key(), res)
+        return res
+
+    def nullable(self, state: SchemaPattern) -> bool:
+        """Return ``True`` if `state` is an accepting state."""
+        try:
+            return self._nullable[state]
+        except KeyError:
+            res = self._nullable[state] = state.nullable(self.ctype)
+            return res
@@ -25,10 +25,12 @@ class is intended to be public:
 """
 
 import decimal
+import operator
+import sys
 from math import ceil, copysign, floor
-from pyxb.utils.xmlre import XMLToPython
-import re
-from typing import List, Optional, Tuple
+from typing import (TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set,
+                    Tuple)
+from .constraint import compile_pattern
 from .schemadata import SchemaContext
 from .enumerations import Axis, MultiplicativeOp
 from .exceptions import InvalidArgument, XPathTypeError
@@ -36,9 +38,18 @@ from .instance import InstanceNode
 from .nodeset import NodeExpr, NodeSet, XPathValue
 from .typealiases import QualName
 
+if TYPE_CHECKING:
+    from .schemanode import DataNode, SchemaNode    # NOQA
+
+# Type aliases
+XPathFun = Callable[["XPathContext"], XPathValue]
+"""Compiled XPath expression."""
+
 
 class XPathContext:
 
+    __slots__ = ("cnode", "origin", "position", "size")
+
     def __init__(self, cnode: InstanceNode, origin: InstanceNode,
                  position: int, size: int):
         self.cnode = cnode
@@ -53,12 +64,47 @@ class XPathContext:
 class Expr:
     """Abstract class for nodes of XPath AST."""
 
+    __slots__ = ("_compiled",)
+
     indent = 2
 
+    _pure = False
+    """Does the result depend only on the values of operands?"""
+
+    _numeric = False
+    """Is the result always a number?"""
+
+    _textual = False
+    """Is the result always a string?"""
+
+    def __init__(self):
+        """Initialize the class instance."""
+        self._compiled = None  # type: Optional[XPathFun]
+        """Compiled form of the receiver (see :meth:`compile`)."""
+
     def __str__(self) -> str:
         """Return a string representation of the receiver's AST."""
         return self._tree()
 
+    def __getstate__(self) -> Dict[str, Any]:
+        """Return the receiver's state for pickling.
+
+        Closures cannot be pickled, so the compiled form is only
+        recorded as a flag, and recompiled upon first evaluation.
+        """
+        res = {}
+        for cls in type(self).__mro__[:-1]:
+            for name in cls.__slots__:
+                res[name] = getattr(self, name)
+        if res["_compiled"]:
+            res["_compiled"] = True
+        return res
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore the receiver's state from unpickled data."""
+        for name in state:
+            setattr(self, name, state[name])
+
     def evaluate(self, node: InstanceNode) -> XPathValue:
         """Evaluate the receiver and return the result.
 
@@ -69,17 +115,134 @@ class Expr:
             XPathTypeError: If a subexpression of the receiver is of a wrong
                 type.
         """
-        return self._eval(XPathContext(node, node, 1, 1))
+        comp = self._compiled
+        if comp is None:
+            return self._eval(XPathContext(node, node, 1, 1))
+        if comp is True:
+            comp = self.compile()
+        return comp(XPathContext(node, node, 1, 1))
+
+    def compile(self) -> XPathFun:
+        """Compile the receiver into nested Python closures.
+
+        Constant subexpressions are evaluated in advance. After this
+        method is called, :meth:`evaluate` uses the compiled form.
+
+        Returns:
+            Function that evaluates the receiver in an XPath context.
+        """
+        self._compiled = self._compile()
+        return self._compiled
+
+    def _is_constant(self) -> bool:
+        return False
+
+    def _operands(self) -> List["Expr"]:
+        """Return the list of receiver's subexpressions."""
+        return []
+
+    def _bind(self, cnodes: Optional[List["SchemaNode"]], origin: "DataNode",
+              unresolved: List["Step"], deps: Set[Optional["SchemaNode"]]
+              ) -> Optional[List["SchemaNode"]]:
+        """Bind location steps to schema nodes.
+
+        Args:
+            cnodes: Possible schema nodes of context nodes (or ``None``
+                if unknown).
+            origin: Schema node of the node for which the receiver is
+                to be evaluated.
+            unresolved: List to which steps selecting no schema node
+                are appended.
+            deps: Set to which schema nodes of all nodes that may be
+                accessed are added (``None`` stands for any node).
+
+        Returns:
+            Possible schema nodes of the resulting node-set, or
+            ``None`` if they are not known.
+        """
+        for op in self._operands():
+            op._bind(cnodes, origin, unresolved, deps)
+        return None
+
+    def _ascent(self) -> Optional[int]:
+        """Return the maximum number of levels the receiver goes up.
+
+        The result is an upper bound of the number of levels above
+        the context node that the receiver may access, or ``None``
+        if the receiver can access any node in the data tree.
+        """
+        return self._sum_ascents(self._operands())
+
+    @staticmethod
+    def _sum_ascents(exprs: List["Expr"]) -> Optional[int]:
+        res = 0
+        for e in exprs:
+            asc = e._ascent()
+            if asc is None:
+                return None
+            res += asc
+        return res
+
+    def _compile(self) -> XPathFun:
+        return self._fold(self._eval) or self._closure()
+
+    def _compile_float(self) -> Callable[[XPathContext], float]:
+        res = self._fold(self._eval_float)
+        if res:
+            return res
+        fun = self._closure()
+        if self._numeric:
+            return fun
+        conv = self._float_value
+        return lambda xctx: conv(fun(xctx))
+
+    def _compile_string(self) -> Callable[[XPathContext], str]:
+        res = self._fold(self._eval_string)
+        if res:
+            return res
+        fun = self._closure()
+        if self._textual:
+            return fun
+        conv = self._string_value
+        return lambda xctx: conv(fun(xctx))
+
+    def _fold(self, meth: XPathFun) -> Optional[XPathFun]:
+        """Return constant function if the receiver is constant.
+
+        Args:
+            meth: Evaluation method to be used.
+        """
+        if not self._is_constant():
+            return None
+        try:
+            val = meth(None)
+        except (InvalidArgument, XPathTypeError, TypeError, ValueError):
+            return None                       # report during evaluation
+        return lambda xctx: val
+
+    def _closure(self) -> XPathFun:
+        """Return a function evaluating the receiver.
+
+        Subclasses override this method with specialised closures,
+        otherwise the interpreter is used.
+        """
+        return self._eval
 
     def _eval_float(self, xctx: XPathContext) -> float:
-        val = self._eval(xctx)
+        return self._float_value(self._eval(xctx))
+
+    def _eval_string(self, xctx: XPathContext) -> str:
+        return self._string_value(self._eval(xctx))
+
+    @staticmethod
+    def _float_value(val: XPathValue) -> float:
         try:
             return float(val)
         except ValueError:
             return float('nan')
 
-    def _eval_string(self, xctx: XPathContext) -> str:
-        val = self._eval(xctx)
+    @staticmethod
+    def _string_value(val: XPathValue) -> str:
         if isinstance(val, float):
             try:
                 if int(val) == val:
@@ -116,11 +279,18 @@ class Expr:
 
     def _apply_predicates(self, ns: XPathValue,
                           xctx: XPathContext) -> XPathValue:
-        for p in self.predicates:
+        if not self.predicates:
+            return ns
+        return self._filter(ns, xctx, [p._eval for p in self.predicates])
+
+    @staticmethod
+    def _filter(ns: XPathValue, xctx: XPathContext,
+                preds: List[XPathFun]) -> XPathValue:
+        for p in preds:
             res = NodeSet([])
             size = len(ns)
             for i in range(size):
-                pval = p._eval(XPathContext(ns[i], xctx.origin, i + 1, size))
+                pval = p(XPathContext(ns[i], xctx.origin, i + 1, size))
                 try:
                     if isinstance(pval, float) and pval > 0:
                         res.append(ns[int(pval) - 1])
@@ -136,23 +306,58 @@ class Expr:
 class UnaryExpr(Expr):
     """Abstract superclass for unary expressions."""
 
+    __slots__ = ("expr",)
+
     def __init__(self, expr: Optional[Expr]):
+        super().__init__()
         self.expr = expr
 
     def _children_str(self, indent: int) -> str:
         return self.expr._tree(indent) if self.expr else ""
 
+    def _is_constant(self) -> bool:
+        return (self._pure and self.expr is not None and
+                self.expr._is_constant())
+
+    def _operands(self) -> List[Expr]:
+        return [self.expr] if self.expr else []
+
+    def _bind(self, cnodes: Optional[List["SchemaNode"]], origin: "DataNode",
+              unresolved: List["Step"], deps: Set[Optional["SchemaNode"]]
+              ) -> Optional[List["SchemaNode"]]:
+        """Extend the superclass method.
+
+        Functions called without an argument use the context node.
+        """
+        if self.expr is None:
+            if cnodes is None:
+                deps.add(None)
+            else:
+                deps.update(cnodes)
+            return None
+        return super()._bind(cnodes, origin, unresolved, deps)
+
 
 class BinaryExpr(Expr):
     """Abstract superclass of binary expressions."""
 
+    __slots__ = ("left", "right")
+
     def __init__(self, left: Expr, right: Expr):
+        super().__init__()
         self.left = left
         self.right = right
 
     def _children_str(self, indent: int) -> str:
         return self.left._tree(indent) + self.right._tree(indent)
 
+    def _is_constant(self) -> bool:
+        return (self._pure and self.left._is_constant() and
+                self.right._is_constant())
+
+    def _operands(self) -> List[Expr]:
+        return [self.left, self.right]
+
     def _eval_ops(self, xctx: XPathContext) -> Tuple[XPathValue, XPathValue]:
         return (self.left._eval(xctx), self.right._eval(xctx))
 
@@ -165,20 +370,40 @@ class BinaryExpr(Expr):
 
 class OrExpr(BinaryExpr):
 
+    __slots__ = ()
+
+    _pure = True
+
     def _eval(self, xctx: XPathContext) -> bool:
-        lres, rres = self._eval_ops(xctx)
-        return lres or rres
+        return self.left._eval(xctx) or self.right._eval(xctx)
+
+    def _closure(self) -> XPathFun:
+        left = self.left._compile()
+        right = self.right._compile()
+        return lambda xctx: left(xctx) or right(xctx)
 
 
 class AndExpr(BinaryExpr):
 
+    __slots__ = ()
+
+    _pure = True
+
     def _eval(self, xctx: XPathContext) -> bool:
-        lres, rres = self._eval_ops(xctx)
-        return lres and rres
+        return self.left._eval(xctx) and self.right._eval(xctx)
+
+    def _closure(self) -> XPathFun:
+        left = self.left._compile()
+        right = self.right._compile()
+        return lambda xctx: left(xctx) and right(xctx)
 
 
 class EqualityExpr(BinaryExpr):
 
+    __slots__ = ("negate",)
+
+    _pure = True
+
     def __init__(self, left: Expr, right: Expr, negate: bool):
         super().__init__(left, right)
         self.negate = negate
@@ -190,9 +415,20 @@ class EqualityExpr(BinaryExpr):
         lres, rres = self._eval_ops(xctx)
         return lres != rres if self.negate else lres == rres
 
+    def _closure(self) -> XPathFun:
+        left = self.left._compile()
+        right = self.right._compile()
+        if self.negate:
+            return lambda xctx: left(xctx) != right(xctx)
+        return lambda xctx: left(xctx) == right(xctx)
+
 
 class RelationalExpr(BinaryExpr):
 
+    __slots__ = ("less", "equal")
+
+    _pure = True
+
     def __init__(self, left: Expr, right: Expr, less: bool,
                  equal: bool):
         super().__init__(left, right)
@@ -211,9 +447,23 @@ class RelationalExpr(BinaryExpr):
             return lres <= rres if self.equal else lres < rres
         return lres >= rres if self.equal else lres > rres
 
+    def _closure(self) -> XPathFun:
+        left = self.left._compile()
+        right = self.right._compile()
+        if self.less:
+            op = operator.le if self.equal else operator.lt
+        else:
+            op = operator.ge if self.equal else operator.gt
+        return lambda xctx: op(left(xctx), right(xctx))
+
 
 class AdditiveExpr(BinaryExpr):
 
+    __slots__ = ("plus",)
+
+    _pure = True
+    _numeric = True
+
     def __init__(self, left: Expr, right: Expr, plus: bool):
         super().__init__(left, right)
         self.plus = plus
@@ -225,9 +475,21 @@ class AdditiveExpr(BinaryExpr):
         lres, rres = self._eval_ops_float(xctx)
         return lres + rres if self.plus else lres - rres
 
+    def _closure(self) -> XPathFun:
+        left = self.left._compile_float()
+        right = self.right._compile_float()
+        if self.plus:
+            return lambda xctx: left(xctx) + right(xctx)
+        return lambda xctx: left(xctx) - right(xctx)
+
 
 class MultiplicativeExpr(BinaryExpr):
 
+    __slots__ = ("operator",)
+
+    _pure = True
+    _numeric = True
+
     def __init__(self, left: Expr, right: Expr,
                  operator: MultiplicativeOp):
         super().__init__(left, right)
@@ -242,7 +504,16 @@ class MultiplicativeExpr(BinaryExpr):
             return "mod"
 
     def _eval(self, xctx: XPathContext) -> float:
-        lres, rres = self._eval_ops_float(xctx)
+        return self._operate(*self._eval_ops_float(xctx))
+
+    def _closure(self) -> XPathFun:
+        left = self.left._compile_float()
+        right = self.right._compile_float()
+        if self.operator == MultiplicativeOp.multiply:
+            return lambda xctx: left(xctx) * right(xctx)
+        return lambda xctx: self._operate(left(xctx), right(xctx))
+
+    def _operate(self, lres: float, rres: float) -> float:
         if self.operator == MultiplicativeOp.multiply:
             return lres * rres
         if self.operator == MultiplicativeOp.divide:
@@ -259,6 +530,11 @@ class MultiplicativeExpr(BinaryExpr):
 
 class UnaryMinusExpr(UnaryExpr):
 
+    __slots__ = ("negate",)
+
+    _pure = True
+    _numeric = True
+
     def __init__(self, expr: Expr, negate: bool):
         super().__init__(expr)
         self.negate = negate
@@ -270,121 +546,337 @@ class UnaryMinusExpr(UnaryExpr):
         res = self.expr._eval_float(xctx)
         return -res if self.negate else res
 
+    def _closure(self) -> XPathFun:
+        fun = self.expr._compile_float()
+        if self.negate:
+            return lambda xctx: -fun(xctx)
+        return fun
+
 
 class UnionExpr(BinaryExpr):
 
+    __slots__ = ()
+
     def _eval(self, xctx: XPathContext) -> NodeSet:
         lres, rres = self._eval_ops(xctx)
         return lres.union(rres)
 
+    def _closure(self) -> XPathFun:
+        left = self.left._compile()
+        right = self.right._compile()
+        return lambda xctx: left(xctx).union(right(xctx))
+
 
 class Literal(Expr):
 
+    __slots__ = ("value",)
+
+    _textual = True
+
     def __init__(self, value: str):
+        super().__init__()
         self.value = value
 
     def _properties_str(self) -> str:
         return self.value
 
+    def _is_constant(self) -> bool:
+        return True
+
     def _eval(self, xctx: XPathContext) -> str:
         return self.value
 
 
 class Number(Expr):
 
+    __slots__ = ("value",)
+
+    _numeric = True
+
     def __init__(self, value: float):
+        super().__init__()
         self.value = value
 
     def _properties_str(self) -> str:
         return str(self.value)
 
+    def _is_constant(self) -> bool:
+        return True
+
     def _eval(self, xctx: XPathContext) -> float:
         return float(self.value)
 
 
 class PathExpr(BinaryExpr):
 
+    __slots__ = ()
+
     def _eval(self, xctx: XPathContext) -> XPathValue:
         ns = self.left._eval(xctx)
         if not isinstance(ns, NodeSet):
             raise XPathTypeError(str(ns))
-        res = NodeSet([])
-        for n in ns:
-            res = res.union(self.right._eval(xctx.update_cnode(n)))
-        return res
+        return ns.bind(lambda n: self.right._eval(xctx.update_cnode(n)))
+
+    def _bind(self, cnodes: Optional[List["SchemaNode"]], origin: "DataNode",
+              unresolved: List["Step"], deps: Set[Optional["SchemaNode"]]
+              ) -> Optional[List["SchemaNode"]]:
+        lres = self.left._bind(cnodes, origin, unresolved, deps)
+        return self.right._bind(lres, origin, unresolved, deps)
+
+    def _closure(self) -> XPathFun:
+        left = self.left._compile()
+        right = self.right._compile()
+
+        def comp(xctx: XPathContext) -> NodeSet:
+            ns = left(xctx)
+            if not isinstance(ns, NodeSet):
+                raise XPathTypeError(str(ns))
+            return ns.bind(lambda n: right(xctx.update_cnode(n)))
+        return comp
 
 
 class FilterExpr(Expr):
 
+    __slots__ = ("primary", "predicates")
+
     def __init__(self, primary: Expr, predicates: List[Expr]):
+        super().__init__()
         self.primary = primary
         self.predicates = predicates
 
     def _children_str(self, indent) -> str:
         return self.primary._tree(indent) + self._predicates_str(indent)
 
+    def _bind(self, cnodes: Optional[List["SchemaNode"]], origin: "DataNode",
+              unresolved: List["Step"], deps: Set[Optional["SchemaNode"]]
+              ) -> Optional[List["SchemaNode"]]:
+        res = self.primary._bind(cnodes, origin, unresolved, deps)
+        for p in self.predicates:
+            p._bind(res, origin, unresolved, deps)
+        return res
+
+    def _ascent(self) -> Optional[int]:
+        return self._sum_ascents([self.primary] + self.predicates)
+
     def _eval(self, xctx: XPathContext) -> XPathValue:
         res = self.primary._eval(xctx)
         return self._apply_predicates(res, xctx)
 
+    def _closure(self) -> XPathFun:
+        prim = self.primary._compile()
+        if not self.predicates:
+            return prim
+        preds = [p._compile() for p in self.predicates]
+        filt = self._filter
+        return lambda xctx: filt(prim(xctx), xctx, preds)
+
 
 class LocationPath(BinaryExpr):
 
+    __slots__ = ()
+
     def _eval(self, xctx: XPathContext) -> XPathValue:
         lres = self.left._eval(xctx)
         ns = lres.bind(self.right._node_trans(xctx))
         return self.right._apply_predicates(ns, xctx)
 
+    def _bind(self, cnodes: Optional[List["SchemaNode"]], origin: "DataNode",
+              unresolved: List["Step"], deps: Set[Optional["SchemaNode"]]
+              ) -> Optional[List["SchemaNode"]]:
+        lres = self.left._bind(cnodes, origin, unresolved, deps)
+        return self.right._bind(lres, origin, unresolved, deps)
+
+    def _closure(self) -> XPathFun:
+        left = self.left._compile()
+        trans = self.right._compile_trans()
+        if not self.right.predicates:
+            return lambda xctx: left(xctx).bind(trans(xctx))
+        preds = [p._compile() for p in self.right.predicates]
+        filt = self._filter
+        return lambda xctx: filt(
+            left(xctx).bind(trans(xctx)), xctx, preds)
+
 
 class Root(Expr):
 
+    __slots__ = ()
+
     def _eval(self, xctx: XPathContext) -> NodeSet:
         return NodeSet([xctx.cnode.top()])
 
+    def _bind(self, cnodes: Optional[List["SchemaNode"]], origin: "DataNode",
+              unresolved: List["Step"], deps: Set[Optional["SchemaNode"]]
+              ) -> Optional[List["SchemaNode"]]:
+        return [origin.schema_root()]
+
+    def _ascent(self) -> Optional[int]:
+        return None
+
+    def _closure(self) -> XPathFun:
+        return lambda xctx: NodeSet([xctx.cnode.top()])
+
 
 class Step(Expr):
 
+    __slots__ = ("axis", "qname", "predicates", "_bindings")
+
+    _axis_trans = {
+        Axis.ancestor: lambda n, qn: n._ancestors(qn),
+        Axis.ancestor_or_self: lambda n, qn: n._ancestors_or_self(qn),
+        Axis.child: lambda n, qn: n._children(qn),
+        Axis.descendant: lambda n, qn: n._descendants(qn),
+        Axis.descendant_or_self: lambda n, qn: n._descendants(qn, True),
+        Axis.following_sibling: lambda n, qn: n._following_siblings(qn),
+        Axis.parent: (
+            lambda n, qn: [] if qn and qn != n.parent.qual_name
+            else n._parent()),
+        Axis.preceding_sibling: lambda n, qn: n._preceding_siblings(qn),
+        Axis.self: lambda n, qn: [] if qn and qn != n.qual_name else [n],
+    }
+    """Node transformations for all axes."""
+
+    _axis_ascent = {
+        Axis.ancestor: None,
+        Axis.ancestor_or_self: None,
+        Axis.following_sibling: 1,
+        Axis.parent: 1,
+        Axis.preceding_sibling: 1,
+    }
+    """Number of levels by which axes go up (zero if absent)."""
+
     def __init__(self, axis: Axis, qname: QualName,
                  predicates: List[Expr]):
+        super().__init__()
         self.axis = axis
-        self.qname = qname
+        self.qname = qname if not qname else (
+            sys.intern(qname[0]), qname[1] and sys.intern(qname[1]))
         self.predicates = predicates
+        self._bindings = {}  # type: Dict[SchemaNode, Tuple[QualName, ...]]
+        """Statically resolved children of context schema nodes."""
 
     def _properties_str(self) -> str:
         return "{} {}".format(self.axis.name, self.qname)
 
+    def _bind(self, cnodes: Optional[List["SchemaNode"]], origin: "DataNode",
+              unresolved: List["Step"], deps: Set[Optional["SchemaNode"]]
+              ) -> Optional[List["SchemaNode"]]:
+        """Extend the superclass method.
+
+        For the child axis, the schema node and instance name of the
+        child is recorded for every possible context schema node.
+        Steps along other axes than child, self and parent make the
+        dependencies unknown.
+        """
+        from .schemanode import InternalNode    # circular import
+        res = None
+        if cnodes is not None:
+            qname = ((self.qname[0], origin.ns) if
+                     self.qname and self.qname[1] is None else self.qname)
+            if self.axis == Axis.child:
+                res = []
+                for cn in cnodes:
+                    if not isinstance(cn, InternalNode):
+                        continue
+                    if not qname:
+                        res.extend(cn.data_children())
+                        continue
+                    ch = cn.get_data_child(*qname)
+                    if ch is not None:
+                        self._bindings[cn] = (ch.qual_name, ch, ch.iname())
+                        res.append(ch)
+                if cnodes and not res:
+                    unresolved.append(self)
+            elif self.axis == Axis.self:
+                res = [cn for cn in cnodes
+                       if not qname or cn.qual_name == qname]
+            elif self.axis == Axis.parent and not qname:
+                res = []
+                for cn in cnodes:
+                    par = cn.data_parent()
+                    if par is None and cn.parent is not None:
+                        par = cn.schema_root()
+                    if par is not None:
+                        res.append(par)
+        if res is None:
+            deps.add(None)
+        else:
+            deps.update(res)
+        for p in self.predicates:
+            p._bind(res, origin, unresolved, deps)
+        return res
+
+    def _ascent(self) -> Optional[int]:
+        asc = self._axis_ascent.get(self.axis, 0)
+        if asc is None:
+            return None
+        preds = self._sum_ascents(self.predicates)
+        return None if preds is None else asc + preds
+
     def _children_str(self, indent) -> str:
         return self._predicates_str(indent)
 
     def _node_trans(self, xctx) -> NodeExpr:
         qname = ((self.qname[0], xctx.origin.namespace) if
                  self.qname and self.qname[1] is None else self.qname)
-        return {
-            Axis.ancestor: lambda n, qn=qname: n._ancestors(qn),
-            Axis.ancestor_or_self:
-                lambda n, qn=qname: n._ancestors_or_self(qn),
-            Axis.child: lambda n, qn=qname: n._children(qn),
-            Axis.descendant: lambda n, qn=qname: n._descendants(qn),
-            Axis.descendant_or_self:
-                lambda n, qn=qname: n._descendants(qn, True),
-            Axis.following_sibling:
-                lambda n, qn=qname: n._following_siblings(qn),
-            Axis.parent: (
-                lambda n, qn=qname: [] if qn and qn != n.parent.qual_name
-                else n._parent()),
-            Axis.preceding_sibling:
-                lambda n, qn=qname: n._preceding_siblings(qn),
-            Axis.self:
-                lambda n, qn=qname: [] if qn and qn != n.qual_name else [n],
-        }[self.axis]
+        trans = self._axis_trans[self.axis]
+        return lambda n: trans(n, qname)
+
+    def _compile_trans(self) -> Callable[[XPathContext], NodeExpr]:
+        """Return function selecting the node transformation.
+
+        Unless the namespace of the receiver's name is taken from the
+        context, the transformation is the same for all contexts.
+        """
+        trans = self._axis_trans[self.axis]
+        if self._bindings:
+            trans = self._bound_trans(trans)
+        qname = self.qname
+        if qname and qname[1] is None:
+            return lambda xctx: (
+                lambda n: trans(n, (qname[0], xctx.origin.namespace)))
+        ntrans = lambda n: trans(n, qname)         # NOQA
+        return lambda xctx: ntrans
+
+    def _bound_trans(self, trans: Callable[[InstanceNode, QualName],
+                                           List[InstanceNode]]):
+        """Return a child node transformation that uses bindings.
+
+        The bindings apply only if the context node's schema node and
+        the name of the child are the same as during binding,
+        otherwise `trans` is used.
+        """
+        bindings = self._bindings
+
+        def bound(n: InstanceNode, qn: QualName) -> List[InstanceNode]:
+            b = bindings.get(n.schema_node)
+            if b is not None and b[0] == qn:
+                iname = b[2]
+                try:
+                    if iname in n.value:
+                        return n._member(iname, b[1])._node_set()
+                except TypeError:
+                    pass
+            return trans(n, qn)
+        return bound
 
     def _eval(self, xctx: XPathContext) -> XPathValue:
         ns = NodeSet(self._node_trans(xctx)(xctx.cnode))
         return self._apply_predicates(ns, xctx)
 
+    def _closure(self) -> XPathFun:
+        trans = self._compile_trans()
+        if not self.predicates:
+            return lambda xctx: NodeSet(trans(xctx)(xctx.cnode))
+        preds = [p._compile() for p in self.predicates]
+        filt = self._filter
+        return lambda xctx: filt(
+            NodeSet(trans(xctx)(xctx.cnode)), xctx, preds)
+
 
 class FuncBitIsSet(BinaryExpr):
 
+    __slots__ = ()
+
     def _eval(self, xctx: XPathContext) -> bool:
         ns = self.left._eval(xctx)
         if not isinstance(ns, NodeSet):
@@ -398,30 +890,62 @@ class FuncBitIsSet(BinaryExpr):
 
 class FuncBoolean(UnaryExpr):
 
+    __slots__ = ()
+
+    _pure = True
+
     def _eval(self, xctx: XPathContext) -> bool:
         return bool(self.expr._eval(xctx))
 
+    def _closure(self) -> XPathFun:
+        fun = self.expr._compile()
+        return lambda xctx: bool(fun(xctx))
+
 
 class FuncCeiling(UnaryExpr):
 
+    __slots__ = ()
+
+    _pure = True
+    _numeric = True
+
     def _eval(self, xctx: XPathContext) -> float:
         return float(ceil(self.expr._eval_float(xctx)))
 
 
 class FuncConcat(Expr):
 
+    __slots__ = ("parts",)
+
+    _textual = True
+
     def __init__(self, parts: List[Expr]):
+        super().__init__()
         self.parts = parts
 
     def _children_str(self, indent: int) -> str:
         return "".join([ex._tree(indent) for ex in self.parts])
 
+    def _is_constant(self) -> bool:
+        return all([ex._is_constant() for ex in self.parts])
+
+    def _operands(self) -> List[Expr]:
+        return self.parts
+
     def _eval(self, xctx: XPathContext) -> str:
         return "".join([ex._eval_string(xctx) for ex in self.parts])
 
+    def _closure(self) -> XPathFun:
+        parts = [ex._compile_string() for ex in self.parts]
+        return lambda xctx: "".join([p(xctx) for p in parts])
+
 
 class FuncContains(BinaryExpr):
 
+    __slots__ = ()
+
+    _pure = True
+
     def _eval(self, xctx: XPathContext) -> bool:
         lres, rres = self._eval_ops_string(xctx)
         return lres.find(rres) >= 0
@@ -429,19 +953,40 @@ class FuncContains(BinaryExpr):
 
 class FuncCount(UnaryExpr):
 
+    __slots__ = ()
+
+    _numeric = True
+
     def _eval(self, xctx: XPathContext) -> int:
         ns = self.expr._eval(xctx)
         return float(len(ns))
 
+    def _closure(self) -> XPathFun:
+        fun = self.expr._compile()
+        return lambda xctx: float(len(fun(xctx)))
+
 
 class FuncCurrent(Expr):
 
+    __slots__ = ()
+
     def _eval(self, xctx: XPathContext) -> NodeSet:
         return NodeSet([xctx.origin])
 
+    def _bind(self, cnodes: Optional[List["SchemaNode"]], origin: "DataNode",
+              unresolved: List["Step"], deps: Set[Optional["SchemaNode"]]
+              ) -> Optional[List["SchemaNode"]]:
+        deps.add(origin)
+        return [origin]
+
+    def _closure(self) -> XPathFun:
+        return lambda xctx: NodeSet([xctx.origin])
+
 
 class FuncDeref(UnaryExpr):
 
+    __slots__ = ()
+
     def _eval(self, xctx: XPathContext) -> NodeSet:
         ns = self.expr._eval(xctx)
         if not isinstance(ns, NodeSet):
@@ -449,9 +994,35 @@ class FuncDeref(UnaryExpr):
         ref = ns[0]
         return NodeSet(ref._deref())
 
+    def _bind(self, cnodes: Optional[List["SchemaNode"]], origin: "DataNode",
+              unresolved: List["Step"], deps: Set[Optional["SchemaNode"]]
+              ) -> Optional[List["SchemaNode"]]:
+        refs = self.expr._bind(cnodes, origin, unresolved, deps)
+        res = None if refs is None else [r._leafref_target() for r in refs]
+        if res is None or None in res:
+            deps.add(None)
+            return None
+        deps.update(res)
+        return res
+
+    def _ascent(self) -> Optional[int]:
+        return None
+
+    def _closure(self) -> XPathFun:
+        fun = self.expr._compile()
+
+        def comp(xctx: XPathContext) -> NodeSet:
+            ns = fun(xctx)
+            if not isinstance(ns, NodeSet):
+                raise XPathTypeError(str(ns))
+            return NodeSet(ns[0]._deref())
+        return comp
+
 
 class FuncDerivedFrom(BinaryExpr):
 
+    __slots__ = ("or_self", "sctx")
+
     def __init__(self, left: Expr, right: Expr, or_self: bool,
                  sctx: SchemaContext):
         super().__init__(left, right)
@@ -480,6 +1051,10 @@ class FuncDerivedFrom(BinaryExpr):
 
 class FuncEnumValue(UnaryExpr):
 
+    __slots__ = ()
+
+    _numeric = True
+
     def _eval(self, xctx: XPathContext) -> float:
         ns = self.expr._eval(xctx)
         if not isinstance(ns, NodeSet):
@@ -493,24 +1068,42 @@ class FuncEnumValue(UnaryExpr):
 
 class FuncFalse(Expr):
 
+    __slots__ = ()
+
+    def _is_constant(self) -> bool:
+        return True
+
     def _eval(self, xctx: XPathContext) -> bool:
         return False
 
 
 class FuncFloor(UnaryExpr):
 
+    __slots__ = ()
+
+    _pure = True
+    _numeric = True
+
     def _eval(self, xctx: XPathContext) -> float:
         return float(floor(self.expr._eval_float(xctx)))
 
 
 class FuncLast(Expr):
 
+    __slots__ = ()
+
+    _numeric = True
+
     def _eval(self, xctx: XPathContext) -> int:
         return float(xctx.size)
 
 
 class FuncName(UnaryExpr):
 
+    __slots__ = ("local",)
+
+    _textual = True
+
     def __init__(self, expr: Optional[Expr], local: bool):
         super().__init__(expr)
         self.local = local
@@ -539,6 +1132,11 @@ class FuncName(UnaryExpr):
 
 class FuncNormalizeSpace(UnaryExpr):
 
+    __slots__ = ()
+
+    _pure = True
+    _textual = True
+
     def _eval(self, xctx: XPathContext) -> str:
         string = self.expr._eval_string(xctx) if self.expr else str(xctx.cnode)
         return " ".join(string.strip().split())
@@ -546,12 +1144,25 @@ class FuncNormalizeSpace(UnaryExpr):
 
 class FuncNot(UnaryExpr):
 
+    __slots__ = ()
+
+    _pure = True
+
     def _eval(self, xctx: XPathContext) -> bool:
         return not(self.expr._eval(xctx))
 
+    def _closure(self) -> XPathFun:
+        fun = self.expr._compile()
+        return lambda xctx: not fun(xctx)
+
 
 class FuncNumber(UnaryExpr):
 
+    __slots__ = ()
+
+    _pure = True
+    _numeric = True
+
     def _eval(self, xctx: XPathContext) -> float:
         if self.expr is None:
             try:
@@ -563,22 +1174,52 @@ class FuncNumber(UnaryExpr):
 
 class FuncPosition(Expr):
 
+    __slots__ = ()
+
     def _eval(self, xctx: XPathContext) -> int:
         return xctx.position
 
+    def _closure(self) -> XPathFun:
+        return lambda xctx: xctx.position
+
 
 class FuncReMatch(BinaryExpr):
 
+    __slots__ = ("regex",)
+
+    _pure = True
+
+    def __init__(self, left: Expr, right: Expr):
+        super().__init__(left, right)
+        self.regex = None
+        """Compiled pattern if it is a literal, otherwise ``None``."""
+        if isinstance(right, Literal):
+            try:
+                self.regex = compile_pattern(right.value)
+            except InvalidArgument:
+                pass                          # reported during evaluation
+
     def _eval(self, xctx: XPathContext) -> bool:
-        lres, rres = self._eval_ops_string(xctx)
-        try:
-            return re.match(XMLToPython(rres), lres) is not None
-        except:
-            raise InvalidArgument(rres) from None
+        lres = self.left._eval_string(xctx)
+        regex = (self.regex if self.regex is not None else
+                 compile_pattern(self.right._eval_string(xctx)))
+        return regex.match(lres) is not None
+
+    def _closure(self) -> XPathFun:
+        if self.regex is None:
+            return self._eval
+        left = self.left._compile_string()
+        match = self.regex.match
+        return lambda xctx: match(left(xctx)) is not None
 
 
 class FuncRound(UnaryExpr):
 
+    __slots__ = ()
+
+    _pure = True
+    _numeric = True
+
     def _eval(self, xctx: XPathContext) -> float:
         dec = decimal.Decimal(self.expr._eval_float(xctx))
         try:
@@ -590,6 +1231,10 @@ class FuncRound(UnaryExpr):
 
 class FuncStartsWith(BinaryExpr):
 
+    __slots__ = ()
+
+    _pure = True
+
     def _eval(self, xctx: XPathContext) -> bool:
         lres, rres = self._eval_ops_string(xctx)
         return lres.startswith(rres)
@@ -597,6 +1242,11 @@ class FuncStartsWith(BinaryExpr):
 
 class FuncString(UnaryExpr):
 
+    __slots__ = ()
+
+    _pure = True
+    _textual = True
+
     def _eval(self, xctx: XPathContext) -> str:
         if self.expr is None:
             return str(xctx.cnode)
@@ -605,6 +1255,11 @@ class FuncString(UnaryExpr):
 
 class FuncStringLength(UnaryExpr):
 
+    __slots__ = ()
+
+    _pure = True
+    _numeric = True
+
     def _eval(self, xctx: XPathContext) -> str:
         string = self.expr._eval_string(xctx) if self.expr else str(xctx.cnode)
         return float(len(string))
@@ -612,6 +1267,11 @@ class FuncStringLength(UnaryExpr):
 
 class FuncSubstring(BinaryExpr):
 
+    __slots__ = ("length",)
+
+    _pure = True
+    _textual = True
+
     def __init__(self, string: Expr, start: Expr,
                  length: Optional[Expr]):
         super().__init__(string, start)
@@ -620,6 +1280,14 @@ class FuncSubstring(BinaryExpr):
     def _children_str(self, indent: int) -> str:
         return super()._children_str(indent) + self.length._tree(indent)
 
+    def _is_constant(self) -> bool:
+        return super()._is_constant() and (
+            self.length is None or self.length._is_constant())
+
+    def _operands(self) -> List[Expr]:
+        res = super()._operands()
+        return res + [self.length] if self.length else res
+
     def _eval(self, xctx: XPathContext) -> str:
         string = self.left._eval_string(xctx)
         rres = self.right._eval_float(xctx)
@@ -639,6 +1307,11 @@ class FuncSubstring(BinaryExpr):
 
 class FuncSubstringAfter(BinaryExpr):
 
+    __slots__ = ()
+
+    _pure = True
+    _textual = True
+
     def _eval(self, xctx: XPathContext) -> str:
         lres, rres = self._eval_ops_string(xctx)
         ind = lres.find(rres)
@@ -647,6 +1320,11 @@ class FuncSubstringAfter(BinaryExpr):
 
 class FuncSubstringBefore(BinaryExpr):
 
+    __slots__ = ()
+
+    _pure = True
+    _textual = True
+
     def _eval(self, xctx: XPathContext) -> str:
         lres, rres = self._eval_ops_string(xctx)
         ind = lres.find(rres)
@@ -655,6 +1333,10 @@ class FuncSubstringBefore(BinaryExpr):
 
 class FuncSum(UnaryExpr):
 
+    __slots__ = ()
+
+    _numeric = True
+
     def _eval(self, xctx: XPathContext) -> float:
         ns = self.expr._eval(xctx)
         if not isinstance(ns, NodeSet):
@@ -667,6 +1349,11 @@ class FuncSum(UnaryExpr):
 
 class FuncTranslate(BinaryExpr):
 
+    __slots__ = ("nchars",)
+
+    _pure = True
+    _textual = True
+
     def __init__(self, s1: Expr, s2: Expr, s3: Expr):
         super().__init__(s1, s2)
         self.nchars = s3
@@ -674,6 +1361,12 @@ class FuncTranslate(BinaryExpr):
     def _children_str(self, indent: int) -> str:
         return super()._children_str(indent) + self.nchars._tree(indent)
 
+    def _is_constant(self) -> bool:
+        return super()._is_constant() and self.nchars._is_constant()
+
+    def _operands(self) -> List[Expr]:
+        return super()._operands() + [self.nchars]
+
     def _eval(self, xctx: XPathContext) -> str:
         string, old = self._eval_ops_string(xctx)
         new = self.nchars._eval_string(xctx)[:len(old)]
@@ -683,5 +1376,10 @@ class FuncTranslate(BinaryExpr):
 
 class FuncTrue(Expr):
 
+    __slots__ = ()
+
+    def _is_constant(self) -> bool:
+        return True
+
     def _eval(self, xctx: XPathContext) -> bool:
         return True